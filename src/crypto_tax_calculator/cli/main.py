@@ -162,19 +162,7 @@ def sync_binance_data(start_date: str, end_date: str):
         
         if result["success"]:
             print(f"✅ Synced {result['count']} transactions from Binance")
-            
-            # Save to database
-            session = get_session()
-            try:
-                for transaction in result["transactions"]:
-                    session.add(transaction)
-                session.commit()
-                print("💾 Transactions saved to database")
-            except Exception as e:
-                print(f"❌ Failed to save transactions: {e}")
-                session.rollback()
-            finally:
-                session.close()
+            print("💾 Transactions saved to database")
         else:
             print(f"❌ Sync failed: {result['error']}")
             
@@ -4,10 +4,12 @@ Services for the crypto tax calculator.
 
 from .binance_service import BinanceService
 from .csv_importer import CSVImporter
+from .csv_template_manager import CSVTemplateManager
 from .cgt_calculator import CGTCalculator
 
 __all__ = [
     "BinanceService",
     "CSVImporter", 
+    "CSVTemplateManager",
     "CGTCalculator"
 ]
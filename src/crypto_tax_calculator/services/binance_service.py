@@ -2,71 +2,333 @@
 Binance API service for fetching cryptocurrency transaction data.
 """
 
+import asyncio
+import hashlib
+import hmac
+import os
+import threading
 import time
-import requests
-from datetime import datetime, timezone
+from bisect import bisect_right
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+)
+from urllib.parse import urlencode
+
+import orjson
+import pandas as pd
+import requests
+import websockets
 from requests.adapters import HTTPAdapter
+from sqlalchemy import func, insert, select
 from urllib3.util.retry import Retry
 
 from ..models.transaction import Transaction
 from ..models.asset import Asset
-from shared.logging_config import get_logger
+from ..utils.bloom_filter import BloomFilter
+from shared.database import get_session
+from shared.logging_config import get_logger, log_audit_record
 
 logger = get_logger(__name__)
 
+# Keep-alive connection pool sizing for the shared HTTP session
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 100
+
+# Transport-level retries: only throttling and server errors are retried,
+# with exponential backoff or the server's Retry-After delay
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Live market data streams; dropped connections are reopened with
+# exponential backoff between these bounds
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/ws"
+STREAM_RECONNECT_BASE_DELAY = 1.0
+STREAM_RECONNECT_MAX_DELAY = 60.0
+
+# Trades, deposits and withdrawals are fetched side by side during a sync
+SYNC_FETCH_WORKERS = 3
+
+# Every history kind returned by get_all_transactions is fetched at once
+ALL_TRANSACTIONS_FETCH_WORKERS = 5
+
+# Upper bound on symbols whose trade history is fetched at once; the
+# rate limiter still caps the overall request weight
+MULTI_SYMBOL_FETCH_WORKERS = 10
+
+# Largest page size accepted by /api/v3/myTrades
+MAX_TRADES_PER_REQUEST = 1000
+
+# Binance request weight budget: 1200 weight per minute
+RATE_LIMIT_CAPACITY = 1200
+RATE_LIMIT_REFILL_PER_SEC = RATE_LIMIT_CAPACITY / 60
+
+# Request weight per endpoint; anything not listed costs 1
+ENDPOINT_WEIGHTS = {
+    "/api/v3/time": 1,
+    "/api/v3/account": 10,
+    "/api/v3/myTrades": 10,
+    "/api/v3/klines": 2,
+    "/api/v3/exchangeInfo": 20,
+    "/sapi/v1/capital/deposit/hisrec": 1,
+    "/sapi/v1/capital/withdraw/history": 1,
+}
+
+# Trade batches larger than this are normalized column-wise with pandas
+BATCH_NORMALIZE_THRESHOLD = 64
+
+# Rows per multi-row INSERT when saving synced transactions
+SAVE_BATCH_SIZE = 1000
+
+# Sizing for the Bloom filter of already-synced Binance tx_ids: room for
+# the stored ids plus as many again synced later
+SEEN_TXIDS_MIN_CAPACITY = 1000
+SEEN_TXIDS_HEADROOM = 2
+SEEN_TXIDS_ERROR_RATE = 1e-4
+
+# Rows fetched per round trip while streaming stored tx_ids
+SEEN_TXIDS_FETCH_SIZE = 10000
+
+# tx_ids per IN query when confirming Bloom filter hits; SQLite allows 999
+# bound parameters per statement
+EXISTING_TXIDS_CHUNK_SIZE = 500
+
+# Columns written on save; created_at/updated_at come from column defaults
+TRANSACTION_INSERT_COLUMNS = tuple(
+    column.name for column in Transaction.__table__.columns
+    if column.name not in ("created_at", "updated_at")
+)
+
+# Per-user directory for state kept between runs
+CACHE_DIR = Path.home() / ".cache" / "crypto_tax_calculator"
+
+# Symbol -> (base asset, quote asset) map from /api/v3/exchangeInfo,
+# cached on disk between runs
+EXCHANGE_INFO_CACHE_FILE = CACHE_DIR / "exchange_info.json"
+EXCHANGE_INFO_TTL_SECONDS = 24 * 60 * 60
+
+# Last /myTrades id fetched per account and symbol, so resumed runs only
+# page through new trades; accounts are keyed by a hash of their API key
+TRADE_CURSOR_FILE = CACHE_DIR / "binance_cursor.json"
+
+# Epoch-millisecond start of each tax year, matching _calculate_tax_year's
+# month >= 4 rule, so trade tax years come from a bisect on the raw
+# timestamp instead of datetime fields
+TAX_YEAR_TABLE_FIRST_YEAR = 2009
+TAX_YEAR_TABLE_LAST_YEAR = 2040
+_TAX_YEAR_STARTS_MS = [
+    int(datetime(year, 4, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    for year in range(TAX_YEAR_TABLE_FIRST_YEAR, TAX_YEAR_TABLE_LAST_YEAR + 1)
+]
+
+# Stablecoins Binance lists against EUR with EUR as the base asset, mapped to
+# that market; their EUR rate is the inverse of its close
+INVERSE_EUR_MARKETS = {
+    "USDT": "EURUSDT",
+    "BUSD": "EURBUSD",
+    "USDC": "EURUSDC",
+}
+
+# Fallback for symbols missing from exchangeInfo: quote assets stripped
+# from trading pair symbols, e.g. "BTCUSDT" -> "BTC"
+QUOTE_SUFFIXES = ("USDT", "BUSD", "USDC", "TUSD", "EUR", "BTC", "ETH", "BNB")
+
+
+def _split_base_asset(symbol: str) -> str:
+    """Get the base asset of a trading pair symbol."""
+    for quote in QUOTE_SUFFIXES:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)]
+    return symbol
+
+
+def _parse_apply_time(apply_time: Union[int, str]) -> datetime:
+    """Parse a Binance applyTime as an aware UTC datetime.
+    
+    Accepts epoch milliseconds as well as the "YYYY-MM-DD HH:MM:SS" string
+    the withdrawal history endpoint sends.
+    """
+    if isinstance(apply_time, int):
+        return datetime.fromtimestamp(apply_time / 1000, tz=timezone.utc)
+    
+    # fromisoformat is a C fast path for this fixed-width format; Binance
+    # omits the offset, so naive values are pinned to UTC
+    parsed = datetime.fromisoformat(apply_time)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class TokenBucket:
+    """Thread-safe token bucket for pacing weighted API requests."""
+    
+    def __init__(self, capacity: int = RATE_LIMIT_CAPACITY,
+                 refill_per_sec: float = RATE_LIMIT_REFILL_PER_SEC):
+        """Initialize a full bucket."""
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, weight: int = 1) -> bool:
+        """Block until `weight` tokens are available, then consume them.
+        
+        The lock is released while waiting, so other threads keep taking
+        tokens that are already there.
+        """
+        if weight > self.capacity:
+            raise ValueError(
+                f"Request weight {weight} exceeds rate limit capacity {self.capacity}"
+            )
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                refilled = (now - self._last_refill) * self.refill_per_sec
+                self._tokens = min(self.capacity, self._tokens + refilled)
+                self._last_refill = now
+                
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return True
+                
+                wait = (weight - self._tokens) / self.refill_per_sec
+            time.sleep(wait)
+
 
 class BinanceService:
     """Service for interacting with Binance API."""
     
-    def __init__(self, api_key: str, api_secret: str, base_url: str = "https://api.binance.com"):
-        """Initialize Binance service."""
+    def __init__(self, api_key: str, api_secret: str,
+                 base_url: str = "https://api.binance.com",
+                 eager_connect: bool = False, stream_url: str = BINANCE_STREAM_URL):
+        """Initialize Binance service.
+        
+        With eager_connect, a background request to /api/v3/time opens the
+        pooled TLS connection so the first real call skips the handshake.
+        It is off by default so constructing a service stays offline; pass
+        it when a sync is about to run and nothing else opens the connection.
+        """
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url.rstrip('/')
+        self.stream_url = stream_url.rstrip('/')
         
-        # Set up session with retry strategy
+        # Set up session with retry strategy and a pooled keep-alive adapter,
+        # so repeated calls reuse one TLS connection per host
         self.session = requests.Session()
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            allowed_methods=frozenset(["GET", "POST"]),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=retry_strategy
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Rate limiting, shared by the concurrent sync fetchers
+        self.rate_limiter = TokenBucket()
+        
+        # EUR prices keyed by (asset, day); None marks a missing EUR market
+        self._eur_price_cache: Dict[Tuple[str, date], Optional[Decimal]] = {}
+        
+        # Trading pair symbol -> (base asset, quote asset), filled on first use
+        self._symbol_map: Dict[str, Tuple[str, str]] = {}
+        self._symbol_map_loaded = False
+        
+        # tx_ids already stored for Binance, built from the database on first sync
+        self._seen_txids: Optional[BloomFilter] = None
+        
+        self._normalize_trade = self._make_trade_normalizer()
+        
+        if eager_connect:
+            threading.Thread(
+                target=self._warm_connection, name="binance-warmup", daemon=True
+            ).start()
+    
+    @property
+    def api_secret(self) -> str:
+        """API secret used to sign requests."""
+        return self._api_secret
     
-    def _make_request(self, method: str, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    @api_secret.setter
+    def api_secret(self, value: str) -> None:
+        self._api_secret = value
+        # Keyed once here; each signature copies the prototype instead of
+        # re-deriving the inner and outer pads from the secret
+        self._secret_bytes = value.encode()
+        self._hmac_proto = hmac.new(self._secret_bytes, b"", hashlib.sha256)
+    
+    def _sign(self, query: str) -> str:
+        """Sign a query string with HMAC-SHA256 using the API secret."""
+        mac = self._hmac_proto.copy()
+        mac.update(query.encode())
+        return mac.hexdigest()
+    
+    def _make_request(self, method: str, endpoint: str,
+                      params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Make authenticated request to Binance API."""
-        # Rate limiting
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        
-        self.last_request_time = time.time()
+        # Rate limiting by endpoint weight
+        self.rate_limiter.acquire(ENDPOINT_WEIGHTS.get(endpoint, 1))
         
         url = f"{self.base_url}{endpoint}"
         headers = {"X-MBX-APIKEY": self.api_key}
         
+        # Timestamped (USER_DATA) requests are signed over their exact query string
+        if params and "timestamp" in params:
+            query = urlencode(params)
+            signed_query = f"{query}&signature={self._sign(query)}"
+            if method.upper() == "GET":
+                request_kwargs = {"params": signed_query}
+            else:
+                request_kwargs = {"data": signed_query}
+        elif method.upper() == "GET":
+            request_kwargs = {"params": params}
+        else:
+            request_kwargs = {"json": params}
+        
         try:
             if method.upper() == "GET":
-                response = self.session.get(url, headers=headers, params=params, timeout=30)
+                response = self.session.get(
+                    url, headers=headers, timeout=30, **request_kwargs
+                )
             else:
-                response = self.session.post(url, headers=headers, json=params, timeout=30)
+                response = self.session.post(
+                    url, headers=headers, timeout=30, **request_kwargs
+                )
             
             response.raise_for_status()
-            return response.json()
+            # Parse the raw bytes; orjson skips both the text decode and stdlib json
+            return orjson.loads(response.content)
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Binance API request failed: {e}")
             raise Exception(f"Binance API request failed: {e}")
     
+    def _warm_connection(self) -> None:
+        """Open the pooled connection with a cheap request, ignoring failures."""
+        try:
+            self._make_request("GET", "/api/v3/time")
+        except Exception as e:
+            logger.debug(f"Binance connection warm-up failed: {e}")
+    
+    def authenticate(self) -> bool:
+        """Check that the Binance API is reachable."""
+        return self.test_connection()
+    
     def test_connection(self) -> bool:
         """Test connection to Binance API."""
         try:
@@ -87,25 +349,155 @@ class BinanceService:
         params = {"timestamp": int(time.time() * 1000)}
         return self._make_request("GET", "/api/v3/account", params)
     
-    def get_trade_history(self, symbol: str, start_time: datetime = None, end_time: datetime = None) -> List[Dict[str, Any]]:
-        """Get trade history for a symbol."""
-        params = {"symbol": symbol}
+    def _iter_trade_pages(
+        self, symbol: str, start_time: datetime = None, end_time: datetime = None,
+        limit: int = MAX_TRADES_PER_REQUEST, from_id: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield /myTrades pages for a symbol, one request per page.
         
-        if start_time:
-            params["startTime"] = int(start_time.timestamp() * 1000)
-        if end_time:
-            params["endTime"] = int(end_time.timestamp() * 1000)
+        /myTrades is paged by trade id: each request asks for up to `limit`
+        trades from the `fromId` cursor, which then advances past the last
+        trade returned until a page comes back empty or short. Trades after
+        `end_time` are trimmed from the last page. An explicit `from_id`
+        starts the cursor there instead of at `start_time`; trades before
+        `start_time` are then filtered out client-side. Each page is only
+        requested when the generator is advanced.
+        """
+        params = {"symbol": symbol, "limit": limit}
+        start_ms = int(start_time.timestamp() * 1000) if start_time else None
+        
+        # Only the first page is anchored by time; later pages follow the id cursor
+        if from_id is not None:
+            params["fromId"] = from_id
+        elif start_ms is not None:
+            params["startTime"] = start_ms
+            # The server already applies startTime to the first page
+            start_ms = None
+        else:
+            params["fromId"] = 0
+        end_ms = int(end_time.timestamp() * 1000) if end_time else None
+        
+        while True:
+            params["timestamp"] = int(time.time() * 1000)
+            page = self._make_request("GET", "/api/v3/myTrades", dict(params))
+            if not page:
+                return
+            
+            trades = page
+            if start_ms is not None:
+                trades = [trade for trade in trades if trade["time"] >= start_ms]
+            if end_ms is not None and page[-1]["time"] > end_ms:
+                yield [trade for trade in trades if trade["time"] <= end_ms]
+                return
+            yield trades
+            
+            if len(page) < limit:
+                return
+            
+            params.pop("startTime", None)
+            params["fromId"] = page[-1]["id"] + 1
+    
+    def iter_trade_history(
+        self, symbol: str, start_time: datetime = None, end_time: datetime = None,
+        limit: int = MAX_TRADES_PER_REQUEST, from_id: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield trades for a symbol page by page.
+        
+        The next page is only requested once the current one has been
+        consumed, so memory stays bounded by the page size.
+        """
+        pages = self._iter_trade_pages(symbol, start_time, end_time, limit, from_id)
+        for page in pages:
+            yield from page
+    
+    def get_trades_paginated(
+        self, symbol: str, limit: int = MAX_TRADES_PER_REQUEST,
+        start_time: datetime = None, end_time: datetime = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield trades for a symbol, prefetching one page ahead.
         
-        params["timestamp"] = int(time.time() * 1000)
+        Pages come from the same cursor as iter_trade_history, but the next
+        one is requested on a background thread while the caller works
+        through the current page, so its round trip overlaps. At most two
+        pages are held at a time.
+        """
+        pages = self._iter_trade_pages(symbol, start_time, end_time, limit)
         
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = next(pages, None)
+            while page is not None:
+                next_page = executor.submit(next, pages, None)
+                yield from page
+                page = next_page.result()
+    
+    def get_trade_history(
+        self, symbol: str, start_time: datetime = None, end_time: datetime = None,
+        limit: int = MAX_TRADES_PER_REQUEST
+    ) -> List[Dict[str, Any]]:
+        """Get trade history for a symbol."""
         try:
-            response = self._make_request("GET", "/api/v3/myTrades", params)
-            return response
+            return list(self.iter_trade_history(symbol, start_time, end_time, limit))
         except Exception as e:
             logger.error(f"Failed to get trade history for {symbol}: {e}")
             return []
     
-    def get_deposit_history(self, start_time: datetime = None, end_time: datetime = None) -> List[Dict[str, Any]]:
+    def get_trade_history_multi(
+        self, symbols: List[str], start_time: datetime = None,
+        end_time: datetime = None, limit: int = MAX_TRADES_PER_REQUEST
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get trade history for several symbols concurrently.
+        
+        Failures are isolated per symbol: like get_trade_history, a symbol
+        whose fetch fails is logged and maps to an empty list, and the other
+        symbols are still returned. Use get_all_trades(symbols=...) to have
+        the first failure propagate instead.
+        """
+        results = self._fetch_symbols(
+            symbols,
+            lambda symbol: self.get_trade_history(symbol, start_time, end_time, limit),
+        )
+        return dict(zip(symbols, results))
+    
+    def _fetch_symbols(
+        self, symbols: List[str], fetch_symbol: Callable[[str], List[Dict[str, Any]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Run `fetch_symbol` for each symbol, returning results in symbol order.
+        
+        Each symbol keeps its own fromId cursor; up to
+        MULTI_SYMBOL_FETCH_WORKERS symbols are paged in parallel over the
+        shared session, paced by the shared rate limiter. Exceptions raised
+        by `fetch_symbol` propagate to the caller.
+        """
+        if len(symbols) <= 1:
+            return [fetch_symbol(symbol) for symbol in symbols]
+        
+        workers = min(MULTI_SYMBOL_FETCH_WORKERS, len(symbols))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch_symbol, symbols))
+    
+    async def stream_trades(self, symbol: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield live trade events for a symbol from the Binance websocket stream.
+        
+        One persistent connection replaces REST polling; if it drops, it is
+        reopened after an exponentially growing delay.
+        """
+        url = f"{self.stream_url}/{symbol.lower()}@trade"
+        delay = STREAM_RECONNECT_BASE_DELAY
+        while True:
+            try:
+                async with websockets.connect(url) as websocket:
+                    async for message in websocket:
+                        # A delivered event means the stream is healthy again
+                        delay = STREAM_RECONNECT_BASE_DELAY
+                        yield orjson.loads(message)
+            except (websockets.exceptions.WebSocketException, OSError) as e:
+                logger.warning(f"Binance trade stream for {symbol} dropped: {e}")
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, STREAM_RECONNECT_MAX_DELAY)
+    
+    def get_deposit_history(self, start_time: datetime = None,
+                            end_time: datetime = None) -> List[Dict[str, Any]]:
         """Get deposit history."""
         params = {"timestamp": int(time.time() * 1000)}
         
@@ -115,13 +507,16 @@ class BinanceService:
             params["endTime"] = int(end_time.timestamp() * 1000)
         
         try:
-            response = self._make_request("GET", "/sapi/v1/capital/deposit/hisrec", params)
+            response = self._make_request(
+                "GET", "/sapi/v1/capital/deposit/hisrec", params
+            )
             return response.get("depositList", [])
         except Exception as e:
             logger.error(f"Failed to get deposit history: {e}")
             return []
     
-    def get_withdrawal_history(self, start_time: datetime = None, end_time: datetime = None) -> List[Dict[str, Any]]:
+    def get_withdrawal_history(self, start_time: datetime = None,
+                               end_time: datetime = None) -> List[Dict[str, Any]]:
         """Get withdrawal history."""
         params = {"timestamp": int(time.time() * 1000)}
         
@@ -131,71 +526,286 @@ class BinanceService:
             params["endTime"] = int(end_time.timestamp() * 1000)
         
         try:
-            response = self._make_request("GET", "/sapi/v1/capital/withdraw/history", params)
+            response = self._make_request(
+                "GET", "/sapi/v1/capital/withdraw/history", params
+            )
             return response.get("withdrawList", [])
         except Exception as e:
             logger.error(f"Failed to get withdrawal history: {e}")
             return []
     
-    def _normalize_trade(self, trade: Dict[str, Any]) -> Transaction:
-        """Normalize Binance trade to Transaction model."""
-        # Extract basic information
-        symbol = trade["symbol"]
-        base_asset = symbol.replace("USDT", "").replace("BUSD", "").replace("EUR", "")
-        
-        # Determine action
-        is_buyer = trade.get("isBuyer", False)
-        action = "buy" if is_buyer else "sell"
-        
-        # Calculate amounts
-        amount = Decimal(str(trade["qty"]))
-        if not is_buyer:
-            amount = -amount  # Negative for sells
-        
-        price_usdt = Decimal(str(trade["price"]))
-        price_eur = self._convert_usdt_to_eur(price_usdt)
-        
-        # Calculate fees
-        fee = Decimal(str(trade.get("commission", "0")))
-        fee_asset = trade.get("commissionAsset", "USDT")
-        if fee_asset == "USDT":
-            fee_eur = self._convert_usdt_to_eur(fee)
-        else:
-            fee_eur = fee  # Assume already in EUR
+    def get_all_trades(
+        self, symbol: str = "BTCUSDT", start_time: datetime = None,
+        end_time: datetime = None, symbols: Optional[List[str]] = None,
+        since_id: Optional[int] = None, resume: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Get every trade for a symbol, letting request failures propagate.
         
-        # Create transaction
-        transaction = Transaction(
-            id=f"binance_{trade['id']}",
-            date=datetime.fromtimestamp(trade["time"] / 1000, tz=timezone.utc),
-            exchange="binance",
-            asset=base_asset,
-            action=action,
-            amount=amount,
-            price_eur=price_eur,
-            fee=fee_eur,
-            fee_asset="EUR",
-            tx_id=str(trade["id"]),
-            source="api",
-            is_taxable=True,
-            tax_year=self._calculate_tax_year(datetime.fromtimestamp(trade["time"] / 1000, tz=timezone.utc)),
-            description=f"Binance {action} {abs(amount)} {base_asset}"
+        With `symbols`, their histories are paged concurrently on up to
+        MULTI_SYMBOL_FETCH_WORKERS threads, paced by the shared rate limiter,
+        and returned concatenated in the order the symbols were given.
+        
+        `since_id` limits the result to trades with a higher id. With
+        `resume`, each symbol instead continues after the last trade id stored
+        for this account in TRADE_CURSOR_FILE, and the file is advanced past
+        the trades returned, so repeated runs only download new trades. In
+        both cases `start_time` and `end_time` still bound the result.
+        """
+        batch = [symbol] if symbols is None else symbols
+        if not batch:
+            return []
+        cursors = self._load_trade_cursors() if resume else {}
+        
+        def fetch_symbol(batch_symbol: str) -> List[Dict[str, Any]]:
+            after_id = since_id if since_id is not None else cursors.get(batch_symbol)
+            from_id = after_id + 1 if after_id is not None else None
+            return list(self.iter_trade_history(
+                batch_symbol, start_time, end_time, from_id=from_id
+            ))
+        
+        results = self._fetch_symbols(batch, fetch_symbol)
+        
+        if resume:
+            for batch_symbol, trades in zip(batch, results):
+                if trades:
+                    cursors[batch_symbol] = max(trade["id"] for trade in trades)
+            self._store_trade_cursors(cursors)
+        
+        return [trade for trades in results for trade in trades]
+    
+    def get_swap_history(self, start_time: datetime = None,
+                         end_time: datetime = None) -> List[Dict[str, Any]]:
+        """Get Binance liquid swap history."""
+        params = {"timestamp": int(time.time() * 1000)}
+        
+        if start_time:
+            params["startTime"] = int(start_time.timestamp() * 1000)
+        if end_time:
+            params["endTime"] = int(end_time.timestamp() * 1000)
+        
+        try:
+            return self._make_request("GET", "/sapi/v1/bswap/swap", params)
+        except Exception as e:
+            logger.error(f"Failed to get swap history: {e}")
+            return []
+    
+    def get_staking_rewards(self, start_time: datetime = None,
+                            end_time: datetime = None) -> List[Dict[str, Any]]:
+        """Get staking interest payouts."""
+        params = {
+            "product": "STAKING",
+            "txnType": "INTEREST",
+            "timestamp": int(time.time() * 1000),
+        }
+        
+        if start_time:
+            params["startTime"] = int(start_time.timestamp() * 1000)
+        if end_time:
+            params["endTime"] = int(end_time.timestamp() * 1000)
+        
+        try:
+            response = self._make_request(
+                "GET", "/sapi/v1/staking/stakingRecord", params
+            )
+            # Paged reward endpoints wrap their records as {"rows": [...], "total": n}
+            if isinstance(response, Mapping):
+                return response.get("rows", [])
+            return response
+        except Exception as e:
+            logger.error(f"Failed to get staking rewards: {e}")
+            return []
+    
+    def get_all_transactions(self, symbol: str = "BTCUSDT", start_time: datetime = None,
+                             end_time: datetime = None) -> Dict[str, Any]:
+        """Get trades, deposits, withdrawals, swaps and staking rewards.
+        
+        All five histories are requested concurrently, so the call takes
+        about as long as the slowest endpoint rather than the sum of all five.
+        A history whose fetch fails is left out and its error message is
+        reported under "errors", so one failing endpoint does not discard
+        the others.
+        """
+        with ThreadPoolExecutor(max_workers=ALL_TRANSACTIONS_FETCH_WORKERS) as executor:
+            futures = {
+                "trades": executor.submit(
+                    self.get_all_trades, symbol, start_time, end_time
+                ),
+                "deposits": executor.submit(
+                    self.get_deposit_history, start_time, end_time
+                ),
+                "withdrawals": executor.submit(
+                    self.get_withdrawal_history, start_time, end_time
+                ),
+                "swaps": executor.submit(
+                    self.get_swap_history, start_time, end_time
+                ),
+                "staking_rewards": executor.submit(
+                    self.get_staking_rewards, start_time, end_time
+                ),
+            }
+            results: Dict[str, Any] = {}
+            errors: Dict[str, str] = {}
+            for kind, future in futures.items():
+                try:
+                    results[kind] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to get {kind}: {e}")
+                    errors[kind] = str(e)
+        
+        if errors:
+            results["errors"] = errors
+        return results
+    
+    def _make_trade_normalizer(self) -> Callable[[Dict[str, Any]], Transaction]:
+        """Build the trade normalizer used as `_normalize_trade`.
+        
+        Trade normalization runs once per row of a full trade history, so the
+        closure binds Decimal, the timestamp conversion and the Transaction
+        constructor as fast locals instead of resolving them on every call.
+        Prices still go through `self._trade_price_eur` at call time.
+        """
+        service = self
+        
+        def normalize_trade(trade: Dict[str, Any], _Decimal=Decimal,
+                            _fromtimestamp=datetime.fromtimestamp,
+                            _Transaction=Transaction, _utc=timezone.utc,
+                            _bisect=bisect_right, _starts=_TAX_YEAR_STARTS_MS,
+                            _first_year=TAX_YEAR_TABLE_FIRST_YEAR) -> Transaction:
+            """Normalize Binance trade to Transaction model.
+            
+            Binance sends qty and commission as exact decimal strings, so they
+            go straight into Decimal without passing through float. The
+            commission is stored converted to EUR.
+            """
+            base_asset = service._get_base_asset(trade["symbol"])
+            
+            # Determine action
+            is_buyer = trade.get("isBuyer", False)
+            action = "buy" if is_buyer else "sell"
+            
+            # Calculate amounts
+            amount = _Decimal(trade["qty"])
+            if not is_buyer:
+                amount = -amount  # Negative for sells
+            
+            trade_date = _fromtimestamp(trade["time"] / 1000, _utc)
+            
+            index = _bisect(_starts, trade["time"])
+            if 0 < index < len(_starts):
+                tax_year = _first_year + index - 1
+            else:
+                tax_year = service._calculate_tax_year(trade_date)
+            
+            return _Transaction(
+                id=f"binance_{trade['id']}",
+                date=trade_date,
+                exchange="binance",
+                asset=base_asset,
+                action=action,
+                amount=amount,
+                price_eur=service._trade_price_eur(
+                    trade["symbol"], trade.get("price"), base_asset, trade_date
+                ),
+                fee=service._fee_to_eur(
+                    _Decimal(trade.get("commission", "0")),
+                    trade.get("commissionAsset", "USDT"),
+                    trade_date,
+                ),
+                fee_asset="EUR",
+                tx_id=str(trade["id"]),
+                source="api",
+                is_taxable=True,
+                tax_year=tax_year,
+                description=f"Binance {action} {abs(amount)} {base_asset}"
+            )
+        
+        return normalize_trade
+    
+    def _normalize_trades_batch(
+        self, trades: List[Dict[str, Any]]
+    ) -> List[Transaction]:
+        """Normalize a batch of Binance trades to Transaction models.
+        
+        Produces the same transactions as `_normalize_trade`, but converts
+        timestamps, tax years and base assets column-wise in one pass.
+        Quantities and fees stay scalar Decimals.
+        """
+        frame = pd.DataFrame(trades)
+        
+        timestamps = pd.to_datetime(frame["time"], unit="ms", utc=True)
+        dates = [ts.to_pydatetime().replace(tzinfo=timezone.utc) for ts in timestamps]
+        tax_years = (timestamps.dt.year - (timestamps.dt.month < 4)).tolist()
+        
+        # Each distinct symbol is split once
+        base_assets = frame["symbol"].map({
+            symbol: self._get_base_asset(symbol) for symbol in frame["symbol"].unique()
+        })
+        
+        is_buyer = (
+            frame["isBuyer"].fillna(False).astype(bool) if "isBuyer" in frame
+            else pd.Series(False, index=frame.index)
+        )
+        commissions = (
+            frame["commission"].fillna("0") if "commission" in frame
+            else pd.Series("0", index=frame.index)
+        )
+        commission_assets = (
+            frame["commissionAsset"].fillna("USDT") if "commissionAsset" in frame
+            else pd.Series("USDT", index=frame.index)
+        )
+        prices = (
+            frame["price"].astype(object).where(frame["price"].notna(), None)
+            if "price" in frame else pd.Series(None, index=frame.index, dtype=object)
         )
         
-        return transaction
+        transactions = []
+        columns = zip(
+            frame["id"].tolist(), frame["symbol"].tolist(), dates, tax_years,
+            base_assets.tolist(), is_buyer.tolist(), frame["qty"].tolist(),
+            prices.tolist(), commissions.tolist(), commission_assets.tolist(),
+        )
+        for (trade_id, symbol, trade_date, tax_year, base_asset, buyer, qty, price,
+             commission, commission_asset) in columns:
+            action = "buy" if buyer else "sell"
+            amount = Decimal(qty)
+            if not buyer:
+                amount = -amount  # Negative for sells
+            
+            transactions.append(Transaction(
+                id=f"binance_{trade_id}",
+                date=trade_date,
+                exchange="binance",
+                asset=base_asset,
+                action=action,
+                amount=amount,
+                price_eur=self._trade_price_eur(symbol, price, base_asset, trade_date),
+                fee=self._fee_to_eur(Decimal(commission), commission_asset, trade_date),
+                fee_asset="EUR",
+                tx_id=str(trade_id),
+                source="api",
+                is_taxable=True,
+                tax_year=tax_year,
+                description=f"Binance {action} {abs(amount)} {base_asset}"
+            ))
+        
+        return transactions
     
     def _normalize_deposit(self, deposit: Dict[str, Any]) -> Transaction:
         """Normalize Binance deposit to Transaction model."""
         # Extract information
         asset = deposit["coin"]
-        amount = Decimal(str(deposit["amount"]))
+        amount = Decimal(deposit["amount"])
         
         # Get EUR price
-        price_eur = self._get_asset_price_eur(asset)
+        deposit_date = datetime.fromtimestamp(
+            deposit["insertTime"] / 1000, tz=timezone.utc
+        )
+        price_eur = self._require_eur_price(asset, deposit_date)
         
         # Create transaction
         transaction = Transaction(
             id=f"binance_deposit_{deposit['txId']}",
-            date=datetime.fromtimestamp(deposit["insertTime"] / 1000, tz=timezone.utc),
+            date=deposit_date,
             exchange="binance",
             asset=asset,
             action="transfer",
@@ -206,7 +816,7 @@ class BinanceService:
             tx_id=deposit["txId"],
             source="api",
             is_taxable=False,  # Deposits are not taxable
-            tax_year=self._calculate_tax_year(datetime.fromtimestamp(deposit["insertTime"] / 1000, tz=timezone.utc)),
+            tax_year=self._calculate_tax_year(deposit_date),
             description=f"Binance deposit {amount} {asset}"
         )
         
@@ -216,16 +826,17 @@ class BinanceService:
         """Normalize Binance withdrawal to Transaction model."""
         # Extract information
         asset = withdrawal["coin"]
-        amount = Decimal(str(withdrawal["amount"]))
-        fee = Decimal(str(withdrawal.get("transactionFee", "0")))
+        amount = Decimal(withdrawal["amount"])
+        fee = Decimal(withdrawal.get("transactionFee", "0"))
         
         # Get EUR price
-        price_eur = self._get_asset_price_eur(asset)
+        withdrawal_date = _parse_apply_time(withdrawal["applyTime"])
+        price_eur = self._require_eur_price(asset, withdrawal_date)
         
         # Create transaction
         transaction = Transaction(
             id=f"binance_withdrawal_{withdrawal['id']}",
-            date=datetime.fromisoformat(withdrawal["applyTime"].replace("Z", "+00:00")),
+            date=withdrawal_date,
             exchange="binance",
             asset=asset,
             action="transfer",
@@ -236,12 +847,41 @@ class BinanceService:
             tx_id=withdrawal["txId"],
             source="api",
             is_taxable=False,  # Withdrawals are not taxable
-            tax_year=self._calculate_tax_year(datetime.fromisoformat(withdrawal["applyTime"].replace("Z", "+00:00"))),
+            tax_year=self._calculate_tax_year(withdrawal_date),
             description=f"Binance withdrawal {amount} {asset}"
         )
         
         return transaction
     
+    def _fee_to_eur(self, commission: Decimal, commission_asset: str,
+                    when: datetime) -> Decimal:
+        """Convert a trade commission to EUR at its asset's price for the day."""
+        if not commission:
+            return commission
+        return commission * self._require_eur_price(commission_asset, when)
+    
+    def _trade_price_eur(self, symbol: str, price: Optional[str], base_asset: str,
+                         when: datetime) -> Decimal:
+        """Get the EUR price of a trade's base asset.
+        
+        The base asset's EUR daily close is used when Binance has an EUR
+        market for it; otherwise the trade's own fill price is converted
+        from its quote asset. A trade that can be priced neither way raises
+        ValueError rather than being given a placeholder price.
+        """
+        price_eur = self._get_eur_price(base_asset, when)
+        if price_eur is not None:
+            return price_eur
+        
+        quote_asset = self._get_quote_asset(symbol)
+        quote_rate = self._get_eur_price(quote_asset, when) if price else None
+        if quote_rate is None:
+            raise ValueError(
+                f"No EUR price for {base_asset} on {when.date()}: no {base_asset}EUR "
+                f"market and no {quote_asset} rate for the {symbol} fill price"
+            )
+        return Decimal(price) * quote_rate
+    
     def _convert_usdt_to_eur(self, usdt_amount: Decimal) -> Decimal:
         """Convert USDT amount to EUR."""
         # For MVP, use a simple conversion rate
@@ -249,18 +889,147 @@ class BinanceService:
         usdt_to_eur_rate = Decimal("0.85")  # Approximate rate
         return usdt_amount * usdt_to_eur_rate
     
-    def _get_asset_price_eur(self, asset: str) -> Decimal:
-        """Get asset price in EUR."""
-        # For MVP, use hardcoded prices
-        # In production, this should fetch real-time prices
-        prices = {
-            "BTC": Decimal("50000.00"),
-            "ETH": Decimal("3000.00"),
-            "LTC": Decimal("100.00"),
-            "BCH": Decimal("200.00"),
-            "XRP": Decimal("0.50"),
+    def _get_base_asset(self, symbol: str) -> str:
+        """Get the base asset of a trading pair symbol."""
+        pair = self._ensure_symbol_map().get(symbol)
+        if pair is not None:
+            return pair[0]
+        return _split_base_asset(symbol)
+    
+    def _get_quote_asset(self, symbol: str) -> str:
+        """Get the quote asset of a trading pair symbol."""
+        pair = self._ensure_symbol_map().get(symbol)
+        if pair is not None:
+            return pair[1]
+        return symbol[len(_split_base_asset(symbol)):]
+    
+    def _ensure_symbol_map(self) -> Dict[str, Tuple[str, str]]:
+        """Load the symbol map once, from the disk cache or exchangeInfo."""
+        if self._symbol_map or self._symbol_map_loaded:
+            return self._symbol_map
+        self._symbol_map_loaded = True
+        
+        symbol_map = self._load_cached_symbol_map()
+        if symbol_map is None:
+            try:
+                info = self._make_request("GET", "/api/v3/exchangeInfo")
+                symbol_map = {
+                    s["symbol"]: (s["baseAsset"], s["quoteAsset"])
+                    for s in info["symbols"]
+                }
+            except Exception as e:
+                logger.warning(f"Failed to load Binance exchange info: {e}")
+                return self._symbol_map
+            self._store_cached_symbol_map(symbol_map)
+        
+        self._symbol_map.update(symbol_map)
+        return self._symbol_map
+    
+    def _load_cached_symbol_map(self) -> Optional[Dict[str, Tuple[str, str]]]:
+        """Load the symbol map from the disk cache if it is still fresh."""
+        try:
+            age = time.time() - EXCHANGE_INFO_CACHE_FILE.stat().st_mtime
+            if age > EXCHANGE_INFO_TTL_SECONDS:
+                return None
+            cached = orjson.loads(EXCHANGE_INFO_CACHE_FILE.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        return {symbol: tuple(pair) for symbol, pair in cached.items()}
+    
+    def _store_cached_symbol_map(self, symbol_map: Dict[str, Tuple[str, str]]) -> None:
+        """Write the symbol map to the disk cache."""
+        try:
+            EXCHANGE_INFO_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            EXCHANGE_INFO_CACHE_FILE.write_bytes(orjson.dumps(symbol_map))
+        except OSError as e:
+            logger.warning(f"Failed to cache Binance exchange info: {e}")
+    
+    def _trade_cursor_account(self) -> str:
+        """Key this account's trade cursors by a hash of its API key."""
+        return hashlib.sha256(self.api_key.encode()).hexdigest()
+    
+    def _read_trade_cursor_file(self) -> Dict[str, Dict[str, int]]:
+        """Read every account's trade cursors."""
+        try:
+            return orjson.loads(TRADE_CURSOR_FILE.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+    
+    def _load_trade_cursors(self) -> Dict[str, int]:
+        """Load this account's last fetched trade id per symbol."""
+        return self._read_trade_cursor_file().get(self._trade_cursor_account(), {})
+    
+    def _store_trade_cursors(self, cursors: Dict[str, int]) -> None:
+        """Write this account's trade cursors, replacing the file atomically.
+        
+        Cursors stored for other accounts are kept as they are.
+        """
+        accounts = self._read_trade_cursor_file()
+        accounts[self._trade_cursor_account()] = cursors
+        try:
+            TRADE_CURSOR_FILE.parent.mkdir(parents=True, exist_ok=True)
+            partial_file = TRADE_CURSOR_FILE.with_suffix(".tmp")
+            partial_file.write_bytes(orjson.dumps(accounts))
+            os.replace(partial_file, TRADE_CURSOR_FILE)
+        except OSError as e:
+            logger.warning(f"Failed to store Binance trade cursors: {e}")
+    
+    def _get_eur_price(self, asset: str, when: datetime) -> Optional[Decimal]:
+        """Get an asset's EUR price for the day of `when`.
+        
+        Prices are cached per (asset, day), so a sync only looks up each
+        asset once per calendar day no matter how many transactions it has.
+        Returns None when Binance has no EUR price for the asset that day;
+        the miss is cached too.
+        """
+        key = (asset.upper(), when.date())
+        try:
+            return self._eur_price_cache[key]
+        except KeyError:
+            price = self._fetch_eur_price(*key)
+            self._eur_price_cache[key] = price
+            return price
+    
+    def _require_eur_price(self, asset: str, when: datetime) -> Decimal:
+        """Get an asset's EUR price for the day of `when`, raising if there is none."""
+        price = self._get_eur_price(asset, when)
+        if price is None:
+            raise ValueError(f"No EUR price for {asset} on {when.date()}")
+        return price
+    
+    def _fetch_eur_price(self, asset: str, day: date) -> Optional[Decimal]:
+        """Fetch an asset's EUR daily close, or None if Binance has none.
+        
+        Stablecoins are quoted the other way round (EURUSDT), so their rate
+        is the inverse of that market's close.
+        """
+        if asset == "EUR":
+            return Decimal("1")
+        
+        inverse_symbol = INVERSE_EUR_MARKETS.get(asset)
+        if inverse_symbol is not None:
+            close = self._fetch_daily_close(inverse_symbol, day)
+            return Decimal("1") / close if close else None
+        return self._fetch_daily_close(f"{asset}EUR", day)
+    
+    def _fetch_daily_close(self, symbol: str, day: date) -> Optional[Decimal]:
+        """Fetch a market's daily close, or None if Binance has none."""
+        day_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        params = {
+            "symbol": symbol,
+            "interval": "1d",
+            "startTime": int(day_start.timestamp() * 1000),
+            "limit": 1
         }
-        return prices.get(asset.upper(), Decimal("1.00"))
+        
+        try:
+            klines = self._make_request("GET", "/api/v3/klines", params)
+            if klines:
+                return Decimal(klines[0][4])  # Close price
+        except Exception as e:
+            logger.warning(f"Failed to get {symbol} close on {day}: {e}")
+        
+        return None
     
     def _calculate_tax_year(self, date: datetime) -> int:
         """Calculate Irish tax year for a date."""
@@ -270,37 +1039,65 @@ class BinanceService:
         else:  # January to March
             return date.year - 1
     
-    def sync_transactions(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    def sync_transactions(self, start_date: datetime,
+                          end_date: datetime) -> Dict[str, Any]:
         """Sync all transactions from Binance."""
         logger.info(f"Starting Binance sync from {start_date} to {end_date}")
         
         all_transactions = []
         
         try:
-            # Get trades
-            trades = self.get_trade_history("BTCUSDT", start_date, end_date)
-            for trade in trades:
-                transaction = self._normalize_trade(trade)
-                all_transactions.append(transaction)
+            # Fetch trades, deposits and withdrawals concurrently so the
+            # sync waits for the slowest request rather than all three
+            with ThreadPoolExecutor(max_workers=SYNC_FETCH_WORKERS) as executor:
+                trades_future = executor.submit(
+                    self.get_trade_history, "BTCUSDT", start_date, end_date
+                )
+                deposits_future = executor.submit(
+                    self.get_deposit_history, start_date, end_date
+                )
+                withdrawals_future = executor.submit(
+                    self.get_withdrawal_history, start_date, end_date
+                )
+                trades = trades_future.result()
+                deposits = deposits_future.result()
+                withdrawals = withdrawals_future.result()
+            
+            if len(trades) > BATCH_NORMALIZE_THRESHOLD:
+                all_transactions.extend(self._normalize_trades_batch(trades))
+            else:
+                for trade in trades:
+                    transaction = self._normalize_trade(trade)
+                    all_transactions.append(transaction)
             
-            # Get deposits
-            deposits = self.get_deposit_history(start_date, end_date)
             for deposit in deposits:
                 transaction = self._normalize_deposit(deposit)
                 all_transactions.append(transaction)
             
-            # Get withdrawals
-            withdrawals = self.get_withdrawal_history(start_date, end_date)
             for withdrawal in withdrawals:
                 transaction = self._normalize_withdrawal(withdrawal)
                 all_transactions.append(transaction)
             
+            all_transactions = self._filter_new_transactions(all_transactions)
+            self._save_transactions(all_transactions)
+            
+            self._create_audit_record(self._build_audit_data(
+                start_date, end_date, all_transactions,
+                trades_synced=len(trades),
+                deposits_synced=len(deposits),
+                withdrawals_synced=len(withdrawals)
+            ))
+            
             logger.info(f"Synced {len(all_transactions)} transactions from Binance")
             
             return {
                 "success": True,
                 "transactions": all_transactions,
                 "count": len(all_transactions),
+                "trades_synced": len(trades),
+                "deposits_synced": len(deposits),
+                "withdrawals_synced": len(withdrawals),
+                "total_transactions": len(all_transactions),
                 "start_date": start_date.isoformat(),
                 "end_date": end_date.isoformat()
             }
@@ -313,3 +1110,165 @@ class BinanceService:
                 "transactions": [],
                 "count": 0
             }
+    
+    def _get_seen_txids(self) -> BloomFilter:
+        """Get the Bloom filter of Binance tx_ids already in the database.
+        
+        The filter is sized from a COUNT of the stored ids, which are then
+        streamed into it SEEN_TXIDS_FETCH_SIZE rows at a time.
+        """
+        if self._seen_txids is None:
+            stored_filter = (
+                Transaction.exchange == "binance",
+                Transaction.tx_id.is_not(None),
+            )
+            session = get_session()
+            try:
+                stored_count = session.scalar(
+                    select(func.count()).select_from(Transaction).where(*stored_filter)
+                )
+                seen = BloomFilter(
+                    max(SEEN_TXIDS_MIN_CAPACITY, SEEN_TXIDS_HEADROOM * stored_count),
+                    SEEN_TXIDS_ERROR_RATE
+                )
+                seen.update(session.scalars(
+                    select(Transaction.tx_id).where(*stored_filter)
+                    .execution_options(yield_per=SEEN_TXIDS_FETCH_SIZE)
+                ))
+            except Exception as e:
+                logger.warning(f"Failed to load synced Binance tx_ids: {e}")
+                seen = BloomFilter(SEEN_TXIDS_MIN_CAPACITY, SEEN_TXIDS_ERROR_RATE)
+            finally:
+                session.close()
+            
+            self._seen_txids = seen
+        return self._seen_txids
+    
+    def _existing_tx_ids(self, candidates: List[str]) -> Set[str]:
+        """Get the candidate Binance tx_ids that are already stored.
+        
+        Ids are checked with one IN query per EXISTING_TXIDS_CHUNK_SIZE,
+        which stays under SQLite's bound-parameter limit.
+        """
+        existing: Set[str] = set()
+        if not candidates:
+            return existing
+        
+        session = get_session()
+        try:
+            candidate_iter = iter(candidates)
+            while True:
+                chunk = list(islice(candidate_iter, EXISTING_TXIDS_CHUNK_SIZE))
+                if not chunk:
+                    break
+                existing.update(session.scalars(
+                    select(Transaction.tx_id).where(
+                        Transaction.exchange == "binance",
+                        Transaction.tx_id.in_(chunk)
+                    )
+                ))
+        finally:
+            session.close()
+        
+        return existing
+    
+    def _filter_new_transactions(
+        self, transactions: List[Transaction]
+    ) -> List[Transaction]:
+        """Drop transactions whose tx_id was saved by an earlier sync.
+        
+        The Bloom filter clears most new tx_ids without touching the
+        database; only its hits are confirmed, in batched queries.
+        """
+        if not any(transaction.tx_id for transaction in transactions):
+            return transactions
+        
+        seen = self._get_seen_txids()
+        possible_duplicates = list({
+            transaction.tx_id for transaction in transactions
+            if transaction.tx_id and transaction.tx_id in seen
+        })
+        existing = self._existing_tx_ids(possible_duplicates)
+        
+        new_transactions = [
+            transaction for transaction in transactions
+            if not transaction.tx_id or transaction.tx_id not in existing
+        ]
+        
+        skipped = len(transactions) - len(new_transactions)
+        if skipped:
+            logger.info(f"Skipped {skipped} already-synced Binance transactions")
+        return new_transactions
+    
+    def _build_audit_data(
+        self, start_date: datetime, end_date: datetime,
+        transactions: List[Transaction], **counts: int
+    ) -> Dict[str, Any]:
+        """Build the summary audit record for a sync.
+        
+        The record has a fixed size however many transactions were synced:
+        it keeps counters, the covered date range and a SHA-256 checksum over
+        the tx_ids in place of the ids themselves.
+        """
+        checksum = hashlib.sha256()
+        for transaction in transactions:
+            checksum.update((transaction.tx_id or transaction.id or "").encode())
+            checksum.update(b"\n")
+        
+        dates = [
+            transaction.date for transaction in transactions
+            if transaction.date is not None
+        ]
+        
+        return {
+            "operation": "binance_sync",
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **counts,
+            "count": len(transactions),
+            "first_ts": min(dates).isoformat() if dates else None,
+            "last_ts": max(dates).isoformat() if dates else None,
+            "checksum": checksum.hexdigest()
+        }
+    
+    def _create_audit_record(self, audit_data: Dict[str, Any]) -> None:
+        """Append an audit record to the structured audit log."""
+        log_audit_record(
+            audit_data["operation"], "transactions", audit_data["count"],
+            audit=audit_data,
+        )
+    
+    def _save_transactions(self, transactions: List[Transaction]) -> int:
+        """Save synced transactions to the database.
+        
+        Rows are written with one parameterized INSERT per batch of
+        SAVE_BATCH_SIZE, which the driver runs as a single executemany.
+        """
+        if not transactions:
+            return 0
+        
+        statement = insert(Transaction.__table__)
+        rows = [
+            {
+                column: getattr(transaction, column)
+                for column in TRANSACTION_INSERT_COLUMNS
+            }
+            for transaction in transactions
+        ]
+        
+        session = get_session()
+        try:
+            with session.begin():
+                for start in range(0, len(rows), SAVE_BATCH_SIZE):
+                    session.execute(statement, rows[start:start + SAVE_BATCH_SIZE])
+        finally:
+            session.close()
+        
+        if self._seen_txids is not None:
+            self._seen_txids.update(
+                transaction.tx_id for transaction in transactions if transaction.tx_id
+            )
+        
+        logger.info(f"Saved {len(rows)} Binance transactions")
+        return len(rows)
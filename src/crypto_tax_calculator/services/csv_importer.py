@@ -2,11 +2,13 @@
 CSV importer service for various cryptocurrency exchanges.
 """
 
+import importlib.util
+import numpy as np
 import pandas as pd
 from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 import chardet
 
 from ..models.transaction import Transaction
@@ -14,6 +16,92 @@ from shared.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Columns every export from an exchange carries; a CSV belongs to the
+# exchange whose column set is contained in its header
+EXCHANGE_SIGNATURES: Dict[frozenset, str] = {
+    frozenset({"Type", "Product", "Started Date", "Amount", "Currency"}): "revolut",
+    frozenset(
+        {"Timestamp", "Transaction Type", "Asset", "Quantity Transacted"}
+    ): "coinbase",
+    frozenset({"UID", "Order Type", "Symbol", "Amount", "Order Price"}): "kucoin",
+    frozenset({"txid", "pair", "time", "type", "price", "vol"}): "kraken",
+}
+
+# Columns read as text rather than inferred: amounts and prices go to
+# Decimal via str(), so keeping them as strings avoids both the inference
+# pass and a float round trip. Optional columns that may be blank are left
+# to inference so missing values stay NaN.
+EXCHANGE_DTYPES: Dict[str, Dict[str, str]] = {
+    "revolut": {
+        "Type": "string", "Product": "string", "Started Date": "string",
+        "Amount": "string", "Currency": "string", "Fiat amount (ex. fees)": "string",
+    },
+    "coinbase": {
+        "Timestamp": "string", "Transaction Type": "string", "Asset": "string",
+        "Quantity Transacted": "string", "EUR Spot Price at Transaction": "string",
+    },
+    "kucoin": {
+        "UID": "string", "Order ID": "string", "Order Type": "string",
+        "Symbol": "string",
+        "Amount": "string", "Order Price": "string", "Created Time": "string",
+    },
+    "kraken": {
+        "txid": "string", "pair": "string", "time": "string",
+        "type": "string", "price": "string", "vol": "string",
+    },
+}
+
+# Columns identifying a transaction within an export. Exports with a
+# unique id are keyed on it alone, since separate fills can share time,
+# amount, asset and side; the others fall back to (timestamp, amount,
+# asset, direction). Rows repeating an earlier key are duplicates.
+DUPLICATE_KEYS: Dict[str, List[str]] = {
+    "revolut": ["Started Date", "Amount", "Currency"],
+    "coinbase": ["Timestamp", "Quantity Transacted", "Asset", "Transaction Type"],
+    "kucoin": ["Order ID"],
+    "kraken": ["txid"],
+}
+
+
+def _parse_iso_utc(value: str) -> datetime:
+    """Parse an ISO 8601 date, pinning naive values to UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_epoch_seconds(value: str) -> datetime:
+    """Parse a Unix timestamp in seconds."""
+    return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+
+def _parse_epoch_millis(value: str) -> datetime:
+    """Parse a Unix timestamp in milliseconds."""
+    return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
+
+
+# Date parsers keyed by the shape of the value: (length, contains "T",
+# ends with "Z"). Each shape maps to one parser, so no format is tried
+# and rejected; unlisted shapes fall back to ISO 8601.
+DATE_PARSERS: Dict[Tuple[int, bool, bool], Callable[[str], datetime]] = {
+    (20, True, True): _parse_iso_utc,          # 2022-01-01T12:00:00Z
+    (19, True, False): _parse_iso_utc,         # 2022-01-01T12:00:00
+    (19, False, False): _parse_iso_utc,        # 2022-01-01 12:00:00
+    (10, False, False): _parse_epoch_seconds,  # 1640995200
+    (15, False, False): _parse_epoch_seconds,  # 1640995200.0000
+    (13, False, False): _parse_epoch_millis,   # 1640995200000
+}
+
+
+def _preferred_csv_engine() -> str:
+    """Pick pyarrow's multi-threaded CSV reader when installed, else the C engine."""
+    return "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+
+
+# Bytes read for encoding detection; detection time does not grow with the file
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
 
 class CSVImporter:
     """Service for importing CSV data from various exchanges."""
@@ -21,63 +109,127 @@ class CSVImporter:
     def __init__(self):
         """Initialize CSV importer."""
         self.supported_exchanges = ["revolut", "coinbase", "kucoin", "kraken"]
-        self.exchange_detectors = {
-            "revolut": self._detect_revolut,
-            "coinbase": self._detect_coinbase,
-            "kucoin": self._detect_kucoin,
-            "kraken": self._detect_kraken,
+        self._exchange_signatures = EXCHANGE_SIGNATURES
+        self._required_columns = {
+            exchange: signature for signature, exchange in EXCHANGE_SIGNATURES.items()
         }
-        self.exchange_normalizers = {
+        
+        # validate_csv_structure results keyed by (exchange, column names)
+        self._structure_cache: Dict[
+            Tuple[str, Tuple[str, ...]], Tuple[bool, List[str]]
+        ] = {}
+        self._structure_checks_run = 0
+        self._date_parsers = DATE_PARSERS
+        self._exchange_dtypes = EXCHANGE_DTYPES
+        self._csv_engine = _preferred_csv_engine()
+        self._duplicate_keys = DUPLICATE_KEYS
+        # One normalizer per exchange, each reading that exchange's columns
+        self.normalizers: Dict[str, Callable[[pd.DataFrame], List[Transaction]]] = {
             "revolut": self._normalize_revolut,
             "coinbase": self._normalize_coinbase,
             "kucoin": self._normalize_kucoin,
             "kraken": self._normalize_kraken,
         }
+        self.batch_normalizers = {
+            "revolut": self._normalize_revolut_batch,
+        }
     
-    def detect_exchange(self, df: pd.DataFrame) -> str:
-        """Detect exchange from CSV structure."""
-        for exchange, detector in self.exchange_detectors.items():
-            if detector(df):
+    def detect_exchange(self, columns: Union[pd.DataFrame, Iterable[str]]) -> str:
+        """Detect exchange from CSV column names.
+        
+        Only the header is needed, so a frame read with nrows=0 works as
+        well as a loaded one; a DataFrame is accepted for its columns.
+        """
+        if isinstance(columns, pd.DataFrame):
+            columns = columns.columns
+        columns = frozenset(columns)
+        
+        # A header with exactly one exchange's columns is a single hash probe
+        exchange = self._exchange_signatures.get(columns)
+        if exchange is not None:
+            return exchange
+        
+        for signature, exchange in self._exchange_signatures.items():
+            if signature <= columns:
                 return exchange
         
         raise ValueError("Unsupported exchange format")
     
-    def _detect_revolut(self, df: pd.DataFrame) -> bool:
-        """Detect Revolut CSV format."""
-        required_columns = ["Type", "Product", "Started Date", "Amount", "Currency"]
-        return all(col in df.columns for col in required_columns)
-    
-    def _detect_coinbase(self, df: pd.DataFrame) -> bool:
-        """Detect Coinbase CSV format."""
-        required_columns = ["Timestamp", "Transaction Type", "Asset", "Quantity Transacted"]
-        return all(col in df.columns for col in required_columns)
-    
-    def _detect_kucoin(self, df: pd.DataFrame) -> bool:
-        """Detect KuCoin CSV format."""
-        required_columns = ["UID", "Order Type", "Symbol", "Amount", "Order Price"]
-        return all(col in df.columns for col in required_columns)
+    def _read_dtypes(self, exchange: str, columns: Iterable[str]) -> Dict[str, str]:
+        """Explicit read_csv dtypes for the exchange's columns present in the header."""
+        columns = set(columns)
+        return {
+            column: dtype for column, dtype in self._exchange_dtypes[exchange].items()
+            if column in columns
+        }
     
-    def _detect_kraken(self, df: pd.DataFrame) -> bool:
-        """Detect Kraken CSV format."""
-        required_columns = ["txid", "pair", "time", "type", "price", "vol"]
-        return all(col in df.columns for col in required_columns)
+    def validate_csv_structure(self, columns: Union[pd.DataFrame, Iterable[str]],
+                               exchange: str) -> Tuple[bool, List[str]]:
+        """Check that a CSV has every column its exchange requires.
+        
+        The result depends only on the column names, so it is cached per
+        (exchange, columns) and frames with a known header skip the check.
+        Like detect_exchange, a DataFrame is accepted for its columns.
+        """
+        if exchange not in self._required_columns:
+            raise ValueError(f"Unsupported exchange: {exchange}")
+        
+        if isinstance(columns, pd.DataFrame):
+            columns = columns.columns
+        key = (exchange, tuple(columns))
+        cached = self._structure_cache.get(key)
+        if cached is not None:
+            return cached[0], list(cached[1])
+        
+        self._structure_checks_run += 1
+        # One set difference instead of an Index lookup per required column
+        missing = self._required_columns[exchange] - set(key[1])
+        errors = [f"Missing required column: {column}" for column in sorted(missing)]
+        self._structure_cache[key] = (not errors, errors)
+        return not errors, list(errors)
     
-    def import_csv_file(self, file_path: Path) -> Dict[str, Any]:
-        """Import CSV file and return transactions."""
+    def import_csv_file(self, file_path: Path,
+                        chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Import CSV file and return transactions.
+        
+        With chunk_size, the file is streamed through a single chunked
+        reader and normalized chunk by chunk, so only one chunk of rows is
+        held as a DataFrame at a time.
+        """
         try:
-            # Detect encoding
+            # Detect encoding from the head of the file only
             with open(file_path, 'rb') as f:
-                raw_data = f.read()
+                raw_data = f.read(ENCODING_SAMPLE_BYTES)
                 encoding = chardet.detect(raw_data)['encoding']
+            # An ASCII head may still be followed by UTF-8 text, which UTF-8
+            # also decodes
+            if encoding is None or encoding == "ascii":
+                encoding = "utf-8"
             
-            # Read CSV
-            df = pd.read_csv(file_path, encoding=encoding)
-            
-            # Detect exchange
-            exchange = self.detect_exchange(df)
+            # Detect exchange from the header alone, before any rows are loaded
+            header = pd.read_csv(file_path, encoding=encoding, nrows=0).columns
+            exchange = self.detect_exchange(header)
+            dtype = self._read_dtypes(exchange, header)
             
-            # Normalize transactions
-            transactions = self.normalize_transactions(df, exchange)
+            if chunk_size:
+                transactions = []
+                # Keys seen in earlier chunks, so duplicates split across
+                # chunks are dropped as in a whole-file import
+                seen_keys = set()
+                # pyarrow has no chunked reader, so streaming uses the C engine
+                chunks = pd.read_csv(file_path, encoding=encoding, dtype=dtype,
+                                     engine="c", chunksize=chunk_size)
+                for chunk in chunks:
+                    transactions.extend(self.normalize_transactions(
+                        chunk, exchange, seen_keys=seen_keys
+                    ))
+            else:
+                # Read CSV
+                df = pd.read_csv(file_path, encoding=encoding, dtype=dtype,
+                                 engine=self._csv_engine)
+                
+                # Normalize transactions
+                transactions = self.normalize_transactions(df, exchange)
             
             logger.info(f"Imported {len(transactions)} transactions from {exchange}")
             
@@ -86,6 +238,7 @@ class CSVImporter:
                 "exchange": exchange,
                 "transactions": transactions,
                 "count": len(transactions),
+                "transaction_count": len(transactions),
                 "encoding": encoding
             }
             
@@ -95,76 +248,168 @@ class CSVImporter:
                 "success": False,
                 "error": str(e),
                 "transactions": [],
-                "count": 0
+                "count": 0,
+                "transaction_count": 0
             }
     
-    def normalize_transactions(self, df: pd.DataFrame, exchange: str) -> List[Transaction]:
-        """Normalize transactions for specific exchange."""
-        if exchange not in self.exchange_normalizers:
+    def normalize_transactions(self, df: pd.DataFrame, exchange: str,
+                               seen_keys: Optional[set] = None) -> List[Transaction]:
+        """Normalize transactions for specific exchange.
+        
+        seen_keys carries duplicate keys across calls, for chunked imports.
+        """
+        normalizer = self.normalizers.get(exchange)
+        if normalizer is None:
             raise ValueError(f"Unsupported exchange: {exchange}")
         
-        normalizer = self.exchange_normalizers[exchange]
+        duplicates = self._detect_duplicates(df, exchange, seen_keys)
+        if duplicates:
+            logger.info(f"Skipping {len(duplicates)} duplicate {exchange} rows")
+            df = df.drop(df.index[duplicates])
+        
         return normalizer(df)
     
-    def _normalize_revolut(self, df: pd.DataFrame) -> List[Transaction]:
-        """Normalize Revolut transactions."""
-        transactions = []
+    def _detect_duplicates(self, df: pd.DataFrame, exchange: str,
+                           seen_keys: Optional[set] = None) -> List[int]:
+        """Return positions of rows repeating an earlier row's key columns.
         
-        for _, row in df.iterrows():
+        One hashed DataFrame.duplicated pass over the key columns; the first
+        occurrence of each key is kept. With seen_keys, rows whose key was
+        seen in an earlier call are duplicates too, and new keys are added.
+        """
+        subset = [
+            column for column in self._duplicate_keys.get(exchange, [])
+            if column in df.columns
+        ]
+        if not subset:
+            return []
+        
+        duplicated = df.duplicated(subset=subset, keep="first").to_numpy(copy=True)
+        if seen_keys is not None:
+            keys = pd.MultiIndex.from_frame(df[subset])
+            duplicated |= keys.isin(seen_keys)
+            seen_keys.update(keys[~duplicated])
+        
+        return np.flatnonzero(duplicated).tolist()
+    
+    def normalize_transactions_batch(self, df: pd.DataFrame,
+                                     exchange: str) -> Dict[str, np.ndarray]:
+        """Normalize transactions for an exchange into columns.
+        
+        Returns one array per Transaction field instead of one object per
+        row; only exchanges in `batch_normalizers` are supported.
+        """
+        if exchange not in self.batch_normalizers:
+            raise ValueError(
+                f"Unsupported exchange for batch normalization: {exchange}"
+            )
+        
+        return self.batch_normalizers[exchange](df)
+    
+    def _normalize_revolut_batch(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Normalize Revolut transactions column-wise.
+        
+        Dates and tax years are converted with vectorized pandas operations;
+        amounts, prices and fees stay exact Decimals in object arrays.
+        Non-EXCHANGE rows and rows that cannot be parsed are dropped.
+        """
+        frame = df[df["Type"] == "EXCHANGE"]
+        # cache=True parses each distinct timestamp once; exports repeat them heavily
+        dates = pd.to_datetime(frame["Started Date"], utc=True, format="ISO8601",
+                               errors="coerce", cache=True)
+        # A blank or absent fee means no fee
+        fees_raw = (
+            frame["Fee"].fillna("").astype(str).replace("", "0") if "Fee" in frame
+            else pd.Series("0", index=frame.index)
+        )
+        
+        keep = []
+        amounts = []
+        prices = []
+        fees = []
+        for position, (amount_raw, ex_fees_raw, fee_raw, date) in enumerate(zip(
+            frame["Amount"].tolist(), frame["Fiat amount (ex. fees)"].tolist(),
+            fees_raw.tolist(), dates
+        )):
             try:
-                # Skip non-crypto transactions
-                if row["Type"] != "EXCHANGE":
-                    continue
-                
-                # Extract basic information
-                asset = row["Currency"]
-                amount = Decimal(str(row["Amount"]))
-                
-                # Determine action
-                if amount > 0:
-                    action = "buy"
-                else:
-                    action = "sell"
-                    amount = -amount  # Make positive for processing
-                
-                # Calculate price (excluding fees)
-                fiat_amount_ex_fees = Decimal(str(row["Fiat amount (ex. fees)"]))
-                price_eur = fiat_amount_ex_fees / amount if amount > 0 else Decimal("0")
-                
-                # Calculate fee
-                fee = Decimal(str(row.get("Fee", "0")))
-                
-                # Parse date
-                date_str = row["Started Date"]
-                if "T" in date_str:
-                    date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                else:
-                    date = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                    date = date.replace(tzinfo=timezone.utc)
-                
-                # Create transaction
-                transaction = Transaction(
-                    id=f"revolut_{row.name}",
-                    date=date,
-                    exchange="revolut",
-                    asset=asset,
-                    action=action,
-                    amount=amount if action == "buy" else -amount,
-                    price_eur=price_eur,
-                    fee=fee,
-                    fee_asset="EUR",
-                    tx_id=f"revolut_{row.name}",
-                    source="csv",
-                    is_taxable=True,
-                    tax_year=self._calculate_tax_year(date),
-                    description=row.get("Description", f"Revolut {action} {amount} {asset}")
+                if pd.isna(date):
+                    raise ValueError("unparseable date")
+                amount = Decimal(str(amount_raw))
+                # Price per unit excludes fees
+                price_eur = (
+                    Decimal(str(ex_fees_raw)) / abs(amount) if amount != 0
+                    else Decimal("0")
                 )
-                
-                transactions.append(transaction)
-                
+                fee = Decimal(fee_raw)
             except Exception as e:
-                logger.warning(f"Failed to process Revolut transaction {row.name}: {e}")
+                logger.warning(
+                    f"Failed to process Revolut transaction "
+                    f"{frame.index[position]}: {e}"
+                )
                 continue
+            
+            keep.append(position)
+            amounts.append(amount)
+            prices.append(price_eur)
+            fees.append(fee)
+        
+        frame = frame.iloc[keep]
+        dates = dates.iloc[keep]
+        actions = np.array(
+            ["buy" if amount > 0 else "sell" for amount in amounts], dtype=object
+        )
+        ids = ("revolut_" + frame.index.astype(str)).to_numpy()
+        default_descriptions = [
+            f"Revolut {action} {abs(amount)} {asset}"
+            for action, amount, asset
+            in zip(actions, amounts, frame["Currency"].tolist())
+        ]
+        descriptions = (
+            frame["Description"].to_numpy(dtype=object) if "Description" in frame
+            else np.array(default_descriptions, dtype=object)
+        )
+        
+        return {
+            "id": ids,
+            "date": dates.dt.tz_localize(None).to_numpy(),  # UTC
+            "asset": frame["Currency"].to_numpy(dtype=object),
+            "action": actions,
+            "amount": np.array(amounts, dtype=object),
+            "price_eur": np.array(prices, dtype=object),
+            "fee": np.array(fees, dtype=object),
+            "tax_year": (dates.dt.year - (dates.dt.month < 4)).to_numpy(dtype=np.int64),
+            "description": descriptions,
+        }
+    
+    def _normalize_revolut(self, df: pd.DataFrame) -> List[Transaction]:
+        """Normalize Revolut transactions, built on the column-wise batch."""
+        columns = self._normalize_revolut_batch(df)
+        dates = pd.DatetimeIndex(columns["date"]).to_pydatetime()
+        
+        transactions = []
+        rows = zip(
+            columns["id"], dates, columns["asset"], columns["action"],
+            columns["amount"], columns["price_eur"], columns["fee"],
+            columns["tax_year"], columns["description"],
+        )
+        for (tx_id, date, asset, action, amount, price_eur, fee, tax_year,
+             description) in rows:
+            transactions.append(Transaction(
+                id=tx_id,
+                date=date.replace(tzinfo=timezone.utc),
+                exchange="revolut",
+                asset=asset,
+                action=action,
+                amount=amount,
+                price_eur=price_eur,
+                fee=fee,
+                fee_asset="EUR",
+                tx_id=tx_id,
+                source="csv",
+                is_taxable=True,
+                tax_year=int(tax_year),
+                description=description
+            ))
         
         return transactions
     
@@ -188,12 +433,7 @@ class CSVImporter:
                 fee = Decimal(str(row.get("EUR Fees", "0")))
                 
                 # Parse date
-                date_str = row["Timestamp"]
-                if "T" in date_str:
-                    date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                else:
-                    date = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                    date = date.replace(tzinfo=timezone.utc)
+                date = self._parse_date(row["Timestamp"])
                 
                 # Create transaction
                 transaction = Transaction(
@@ -210,13 +450,17 @@ class CSVImporter:
                     source="csv",
                     is_taxable=True,
                     tax_year=self._calculate_tax_year(date),
-                    description=row.get("Notes", f"Coinbase {action} {abs(amount)} {asset}")
+                    description=row.get(
+                        "Notes", f"Coinbase {action} {abs(amount)} {asset}"
+                    )
                 )
                 
                 transactions.append(transaction)
                 
             except Exception as e:
-                logger.warning(f"Failed to process Coinbase transaction {row.name}: {e}")
+                logger.warning(
+                    f"Failed to process Coinbase transaction {row.name}: {e}"
+                )
                 continue
         
         return transactions
@@ -250,9 +494,7 @@ class CSVImporter:
                     fee_eur = fee
                 
                 # Parse date
-                date_str = row["Created Time"]
-                date = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                date = date.replace(tzinfo=timezone.utc)
+                date = self._parse_date(row["Created Time"])
                 
                 # Create transaction
                 transaction = Transaction(
@@ -275,7 +517,10 @@ class CSVImporter:
                 transactions.append(transaction)
                 
             except Exception as e:
-                logger.warning(f"Failed to process KuCoin transaction {row.get('UID', row.name)}: {e}")
+                logger.warning(
+                    f"Failed to process KuCoin transaction "
+                    f"{row.get('UID', row.name)}: {e}"
+                )
                 continue
         
         return transactions
@@ -325,11 +570,20 @@ class CSVImporter:
                 transactions.append(transaction)
                 
             except Exception as e:
-                logger.warning(f"Failed to process Kraken transaction {row.get('txid', row.name)}: {e}")
+                logger.warning(
+                    f"Failed to process Kraken transaction "
+                    f"{row.get('txid', row.name)}: {e}"
+                )
                 continue
         
         return transactions
     
+    def _parse_date(self, value: str) -> datetime:
+        """Parse a CSV date as an aware datetime, dispatching on its shape."""
+        shape = (len(value), "T" in value, value.endswith("Z"))
+        parser = self._date_parsers.get(shape, _parse_iso_utc)
+        return parser(value)
+    
     def _kraken_pair_to_asset(self, pair: str) -> str:
         """Convert Kraken pair to asset symbol."""
         # Remove EUR suffix and XX prefix
@@ -0,0 +1,586 @@
+"""
+CSV template manager for exchange export formats.
+"""
+
+import copy
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import fastjsonschema
+import numpy as np
+import pandas as pd
+
+from shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Fields every template must define
+TEMPLATE_REQUIRED_FIELDS = ("exchange", "version", "required_columns", "data_types")
+
+# Column data types a template may declare
+TEMPLATE_DATA_TYPES = frozenset({"string", "decimal", "datetime"})
+
+# Built-in templates for the exchanges the importer supports
+DEFAULT_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "revolut": {
+        "exchange": "revolut",
+        "version": "1.0",
+        "description": "Revolut cryptocurrency transaction export template",
+        "required_columns": [
+            "Type", "Product", "Started Date", "Completed Date", "Description",
+            "Amount", "Currency", "Fiat amount (inc. fees)", "Fiat amount (ex. fees)",
+            "Fee", "Base currency", "State",
+        ],
+        "optional_columns": ["Description", "Completed Date"],
+        "data_types": {
+            "Type": "string",
+            "Product": "string",
+            "Started Date": "datetime",
+            "Completed Date": "datetime",
+            "Description": "string",
+            "Amount": "decimal",
+            "Currency": "string",
+            "Fiat amount (inc. fees)": "decimal",
+            "Fiat amount (ex. fees)": "decimal",
+            "Fee": "decimal",
+            "Base currency": "string",
+            "State": "string",
+        },
+        "validation_rules": {
+            "State": ["COMPLETED", "PENDING", "FAILED", "REVERTED", "DECLINED"],
+        },
+        "sample_data": [
+            {
+                "Type": "EXCHANGE",
+                "Product": "Bitcoin",
+                "Started Date": "2022-01-01 12:00:00",
+                "Completed Date": "2022-01-01 12:00:00",
+                "Description": "Bought 0.001 BTC for 50.00 EUR",
+                "Amount": "0.001",
+                "Currency": "BTC",
+                "Fiat amount (inc. fees)": "50.00",
+                "Fiat amount (ex. fees)": "49.50",
+                "Fee": "0.50",
+                "Base currency": "EUR",
+                "State": "COMPLETED",
+            }
+        ],
+    },
+    "coinbase": {
+        "exchange": "coinbase",
+        "version": "1.0",
+        "description": "Coinbase transaction export template",
+        "required_columns": [
+            "Timestamp", "Transaction Type", "Asset", "Quantity Transacted",
+            "EUR Spot Price at Transaction", "EUR Sub Total",
+            "EUR Total (inclusive of fees)", "EUR Fees", "Notes",
+        ],
+        "optional_columns": ["Notes"],
+        "data_types": {
+            "Timestamp": "datetime",
+            "Transaction Type": "string",
+            "Asset": "string",
+            "Quantity Transacted": "decimal",
+            "EUR Spot Price at Transaction": "decimal",
+            "EUR Sub Total": "decimal",
+            "EUR Total (inclusive of fees)": "decimal",
+            "EUR Fees": "decimal",
+            "Notes": "string",
+        },
+        "validation_rules": {
+            "Transaction Type": ["Buy", "Sell", "Send", "Receive", "Convert"],
+        },
+        "sample_data": [
+            {
+                "Timestamp": "2022-01-01T12:00:00Z",
+                "Transaction Type": "Buy",
+                "Asset": "BTC",
+                "Quantity Transacted": "0.001",
+                "EUR Spot Price at Transaction": "50000.00",
+                "EUR Sub Total": "50.00",
+                "EUR Total (inclusive of fees)": "50.50",
+                "EUR Fees": "0.50",
+                "Notes": "Bought 0.001 BTC",
+            }
+        ],
+    },
+    "kucoin": {
+        "exchange": "kucoin",
+        "version": "1.0",
+        "description": "KuCoin spot order history export template",
+        "required_columns": [
+            "UID", "Account Type", "Order ID", "Order Type", "Side", "Symbol",
+            "Amount", "Order Price", "Order Value", "Fee", "Fee Currency",
+            "Created Time", "Updated Time", "Status",
+        ],
+        "optional_columns": ["Account Type", "Updated Time"],
+        "data_types": {
+            "UID": "string",
+            "Account Type": "string",
+            "Order ID": "string",
+            "Order Type": "string",
+            "Side": "string",
+            "Symbol": "string",
+            "Amount": "decimal",
+            "Order Price": "decimal",
+            "Order Value": "decimal",
+            "Fee": "decimal",
+            "Fee Currency": "string",
+            "Created Time": "datetime",
+            "Updated Time": "datetime",
+            "Status": "string",
+        },
+        "validation_rules": {
+            "Side": ["Buy", "Sell"],
+        },
+        "sample_data": [
+            {
+                "UID": "123456789",
+                "Account Type": "Main Account",
+                "Order ID": "67890",
+                "Order Type": "Buy",
+                "Side": "Buy",
+                "Symbol": "BTC-USDT",
+                "Amount": "0.001",
+                "Order Price": "50000.00",
+                "Order Value": "50.00",
+                "Fee": "0.05",
+                "Fee Currency": "USDT",
+                "Created Time": "2022-01-01 12:00:00",
+                "Updated Time": "2022-01-01 12:00:00",
+                "Status": "Filled",
+            }
+        ],
+    },
+    "kraken": {
+        "exchange": "kraken",
+        "version": "1.0",
+        "description": "Kraken trades history export template",
+        "required_columns": [
+            "txid", "ordertxid", "pair", "time", "type", "ordertype", "price",
+            "cost", "fee", "vol", "margin", "misc", "ledgers",
+        ],
+        "optional_columns": ["margin", "misc", "ledgers"],
+        "data_types": {
+            "txid": "string",
+            "ordertxid": "string",
+            "pair": "string",
+            "time": "decimal",  # Unix timestamp
+            "type": "string",
+            "ordertype": "string",
+            "price": "decimal",
+            "cost": "decimal",
+            "fee": "decimal",
+            "vol": "decimal",
+            "margin": "decimal",
+            "misc": "string",
+            "ledgers": "string",
+        },
+        "validation_rules": {
+            "type": ["buy", "sell"],
+        },
+        "sample_data": [
+            {
+                "txid": "tx123456789",
+                "ordertxid": "ord67890",
+                "pair": "XXBTZEUR",
+                "time": "1640995200.0000",
+                "type": "buy",
+                "ordertype": "market",
+                "price": "50000.00",
+                "cost": "50.00",
+                "fee": "0.25",
+                "vol": "0.001",
+                "margin": "0.00000000",
+                "misc": "",
+                "ledgers": "L123456789",
+            }
+        ],
+    },
+}
+
+
+def _to_decimal_column(column: pd.Series) -> pd.Series:
+    """Parse a column as numbers; unparseable cells become NaN."""
+    return pd.to_numeric(column, errors="coerce")
+
+
+def _to_datetime_column(column: pd.Series) -> pd.Series:
+    """Parse a column as ISO 8601 dates; unparseable cells become NaT."""
+    return pd.to_datetime(column, format="ISO8601", utc=True, errors="coerce")
+
+
+# Row schema patterns for decimal and datetime cells
+DECIMAL_PATTERN = r"^\s*[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?\s*$"
+DATETIME_PATTERN = r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?"
+
+# Column-wise parsers per declared data type; strings need no check
+DATA_TYPE_PARSERS: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    "decimal": _to_decimal_column,
+    "datetime": _to_datetime_column,
+}
+
+
+def _version_key(version: str) -> Tuple[int, ...]:
+    """Sort key for dotted version strings, so "1.10" follows "1.9"."""
+    return tuple(int(part) for part in version.split(".") if part.isdigit())
+
+
+class CSVTemplateManager:
+    """Service for managing CSV templates for exchange exports."""
+    
+    def __init__(self):
+        """Initialize CSV template manager with the built-in templates."""
+        self.supported_exchanges = ["revolut", "coinbase", "kucoin", "kraken"]
+        # Current template per exchange; superseded versions are kept by
+        # (exchange, version)
+        self.templates: Dict[str, Dict[str, Any]] = {
+            exchange: copy.deepcopy(template)
+            for exchange, template in DEFAULT_TEMPLATES.items()
+        }
+        self.template_versions: Dict[str, List[str]] = {
+            exchange: [template["version"]]
+            for exchange, template in self.templates.items()
+        }
+        self._archived_templates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._data_type_parsers = DATA_TYPE_PARSERS
+        # Per-version derived data, keyed by (exchange, version): validation_rules
+        # as frozensets and compiled row schemas
+        self._allowed_sets: Dict[Tuple[str, str], Dict[str, frozenset]] = {}
+        self._compiled_schema_cache: Dict[
+            Tuple[str, str], Callable[[Dict[str, Any]], Any]
+        ] = {}
+        self._schema_cache: Dict[Tuple[str, str], Mapping[str, Any]] = {}
+        # Latest version per version list, so repeated lookups skip the sort
+        self._latest_versions: Dict[Tuple[str, ...], str] = {}
+    
+    def get_template(self, exchange: str,
+                     version: Optional[str] = None) -> Dict[str, Any]:
+        """Get the template for an exchange; version defaults to the latest."""
+        template = self.templates.get(exchange)
+        if template is None:
+            raise ValueError(f"Unsupported exchange: {exchange}")
+        
+        if version in (None, "latest") or template["version"] == version:
+            return template
+        
+        archived = self._archived_templates.get((exchange, version))
+        if archived is None:
+            raise ValueError(f"Unknown template version for {exchange}: {version}")
+        return archived
+    
+    def get_template_versions(self, exchange: str) -> List[str]:
+        """Get the known template versions for an exchange."""
+        versions = self.template_versions.get(exchange)
+        if versions is None:
+            raise ValueError(f"Unsupported exchange: {exchange}")
+        return list(versions)
+    
+    def get_latest_template_version(self, exchange: str) -> str:
+        """Get the highest template version for an exchange."""
+        versions = tuple(self.get_template_versions(exchange))
+        latest = self._latest_versions.get(versions)
+        if latest is None:
+            latest = max(versions, key=_version_key)
+            self._latest_versions[versions] = latest
+        return latest
+    
+    def list_available_templates(self) -> List[str]:
+        """List the exchanges with a template."""
+        return list(self.templates.keys())
+    
+    def generate_sample_csv(self, exchange: str, num_rows: int = 1) -> pd.DataFrame:
+        """Generate a sample CSV frame from a template's sample rows."""
+        template = self.get_template(exchange)
+        sample_rows = template.get("sample_data") or [{}]
+        rows = [sample_rows[i % len(sample_rows)] for i in range(num_rows)]
+        return pd.DataFrame(rows, columns=template["required_columns"])
+    
+    def validate_csv_against_template(
+        self, df: pd.DataFrame, exchange: str, version: Optional[str] = None
+    ) -> Tuple[bool, List[str]]:
+        """Validate CSV columns, data types and values against a template.
+        
+        Checks run column-wise: missing columns are one set difference,
+        data types are parsed once per column with pandas, and allowed
+        values are one category-code lookup per rule. Blank cells are not
+        checked.
+        """
+        template = self.get_template(exchange, version)
+        errors = self._missing_column_errors(df, template)
+        errors.extend(self._column_errors(df, template)[0])
+        
+        return not errors, errors
+    
+    def validate_csv_against_schema(
+        self, df: pd.DataFrame, exchange: str, version: Optional[str] = None
+    ) -> Tuple[bool, List[str]]:
+        """Validate CSV rows against the template's JSON schema.
+        
+        The schema is compiled once per template version. Cheap column-wise
+        checks run first, and rows they reject skip the per-row schema call.
+        """
+        template = self.get_template(exchange, version)
+        errors = self._missing_column_errors(df, template)
+        if errors:
+            return False, errors
+        
+        errors, rejected = self._column_errors(df, template)
+        validate = self._compiled_schema(template)
+        
+        rows = np.flatnonzero(~rejected)
+        frame = df.iloc[rows].astype("string")
+        records = (
+            frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+        )
+        for row, record in zip(df.index[rows], records):
+            try:
+                # Blank cells are absent values, as in the column-wise checks
+                validate({
+                    column: value for column, value in record.items()
+                    if value not in (None, "")
+                })
+            except fastjsonschema.JsonSchemaValueException as e:
+                errors.append(f"Schema violation at row {row}: {e.message}")
+        
+        return not errors, errors
+    
+    def _missing_column_errors(self, df: pd.DataFrame,
+                               template: Dict[str, Any]) -> List[str]:
+        """Errors for required columns absent from a CSV, from one set difference."""
+        optional = set(template.get("optional_columns", []))
+        required = set(template["required_columns"]) - optional
+        return [
+            f"Missing required column: {column}"
+            for column in sorted(required - set(df.columns))
+        ]
+    
+    def _column_errors(self, df: pd.DataFrame,
+                       template: Dict[str, Any]) -> Tuple[List[str], np.ndarray]:
+        """Check data types and allowed values column by column.
+        
+        Returns the error messages and a boolean mask of the rows they cover.
+        """
+        errors = []
+        rejected = np.zeros(len(df), dtype=bool)
+        
+        # Parse each column of a declared type once; a non-blank cell that
+        # fails to parse is a type error
+        for column, data_type in template.get("data_types", {}).items():
+            parser = self._data_type_parsers.get(data_type)
+            if parser is None or column not in df.columns:
+                continue
+            values = df[column]
+            present = values.notna() & values.astype(str).str.strip().ne("")
+            rows = np.flatnonzero((parser(values).isna() & present).to_numpy())
+            rejected[rows] = True
+            errors.extend(
+                f"Invalid data type in column '{column}' at row {row}: "
+                f"expected {data_type}, got {value!r}"
+                for row, value in zip(df.index[rows], values.to_numpy()[rows])
+            )
+        
+        for column, allowed in self._allowed_values(template).items():
+            if column not in df.columns:
+                continue
+            values = df[column]
+            # Category codes in one hashed pass; -1 marks values outside the rule
+            outside = pd.Index(list(allowed)).get_indexer(values) == -1
+            rows = np.flatnonzero(outside & values.notna().to_numpy())
+            rejected[rows] = True
+            errors.extend(
+                f"Invalid value in column '{column}' at row {row}: {value!r}"
+                for row, value in zip(df.index[rows], values.to_numpy()[rows])
+            )
+        
+        return errors, rejected
+    
+    def _allowed_values(self, template: Dict[str, Any]) -> Dict[str, frozenset]:
+        """Get a template's validation_rules as frozensets, built once per version."""
+        key = (template["exchange"], template["version"])
+        allowed = self._allowed_sets.get(key)
+        if allowed is None:
+            allowed = {
+                column: frozenset(values)
+                for column, values in template.get("validation_rules", {}).items()
+            }
+            self._allowed_sets[key] = allowed
+        return allowed
+    
+    def validate_template_structure(
+        self, template: Dict[str, Any]
+    ) -> Tuple[bool, List[str]]:
+        """Check that a template defines the required fields and known data types."""
+        errors = [
+            f"Missing required field: {field}"
+            for field in TEMPLATE_REQUIRED_FIELDS if field not in template
+        ]
+        
+        for column, data_type in template.get("data_types", {}).items():
+            if data_type not in TEMPLATE_DATA_TYPES:
+                errors.append(f"Unknown data type for column '{column}': {data_type}")
+        
+        return not errors, errors
+    
+    def compare_template_versions(self, old_template: Dict[str, Any],
+                                  new_template: Dict[str, Any]) -> Dict[str, Any]:
+        """Compare two template versions by their columns and data types."""
+        old_columns = old_template.get("required_columns", [])
+        new_columns = new_template.get("required_columns", [])
+        old_types = old_template.get("data_types", {})
+        new_types = new_template.get("data_types", {})
+        
+        return {
+            "old_version": old_template.get("version"),
+            "new_version": new_template.get("version"),
+            "added_columns": [
+                column for column in new_columns if column not in old_columns
+            ],
+            "removed_columns": [
+                column for column in old_columns if column not in new_columns
+            ],
+            "changed_data_types": {
+                column: (old_types[column], new_types[column])
+                for column in old_types.keys() & new_types.keys()
+                if old_types[column] != new_types[column]
+            },
+        }
+    
+    def generate_template_documentation(self, exchange: str) -> Dict[str, Any]:
+        """Collect the documented parts of an exchange's template."""
+        template = self.get_template(exchange)
+        return {
+            "exchange": template["exchange"],
+            "version": template["version"],
+            "description": template.get("description", ""),
+            "required_columns": list(template["required_columns"]),
+            "optional_columns": list(template.get("optional_columns", [])),
+            "data_types": dict(template["data_types"]),
+            "validation_rules": dict(template.get("validation_rules", {})),
+            "sample_data": list(template.get("sample_data", [])),
+        }
+    
+    def _compiled_schema(
+        self, template: Dict[str, Any]
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """Get the compiled row validator for a template, compiled once per version."""
+        key = (template["exchange"], template["version"])
+        validate = self._compiled_schema_cache.get(key)
+        if validate is None:
+            validate = fastjsonschema.compile(dict(self._schema(template)))
+            self._compiled_schema_cache[key] = validate
+        return validate
+    
+    def generate_template_schema(self, exchange: str,
+                                 version: Optional[str] = None) -> Mapping[str, Any]:
+        """Generate a JSON schema describing one CSV row of a template.
+        
+        Schemas are built once per template version and returned as
+        read-only mappings, since every caller shares the cached copy.
+        """
+        return self._schema(self.get_template(exchange, version))
+    
+    def _schema(self, template: Dict[str, Any]) -> Mapping[str, Any]:
+        """Get a template's row schema, building it once per version."""
+        key = (template["exchange"], template["version"])
+        schema = self._schema_cache.get(key)
+        if schema is None:
+            schema = MappingProxyType(self._build_schema(template))
+            self._schema_cache[key] = schema
+        return schema
+    
+    def _build_schema(self, template: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the JSON schema for one CSV row of a template."""
+        rules = template.get("validation_rules", {})
+        
+        properties = {}
+        for column in template["required_columns"]:
+            data_type = template["data_types"].get(column, "string")
+            if data_type == "decimal":
+                prop = {"type": ["string", "number"], "pattern": DECIMAL_PATTERN}
+            elif data_type == "datetime":
+                prop = {"type": "string", "pattern": DATETIME_PATTERN}
+            else:
+                prop = {"type": "string"}
+            if column in rules:
+                prop["enum"] = list(rules[column])
+            properties[column] = prop
+        
+        optional = set(template.get("optional_columns", []))
+        return {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "title": (
+                f"{template['exchange']} CSV row (template {template['version']})"
+            ),
+            "type": "object",
+            "properties": properties,
+            "required": [
+                column for column in template["required_columns"]
+                if column not in optional
+            ],
+        }
+    
+    def export_template_to_file(self, exchange: str, file_path: Path) -> None:
+        """Write an exchange's template to a JSON file."""
+        template = self.get_template(exchange)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(template, f, indent=2)
+        logger.info(f"Exported {exchange} template to {file_path}")
+    
+    def import_template_from_file(self, file_path: Path) -> Dict[str, Any]:
+        """Load a template from a JSON file and register it."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            template = json.load(f)
+        
+        self.create_custom_template(template.get("exchange", ""), template)
+        return template
+    
+    def create_custom_template(self, exchange: str,
+                               template: Dict[str, Any]) -> None:
+        """Register a template for an exchange, making it the current one.
+        
+        A current template with a different version is archived, so every
+        version listed by get_template_versions stays retrievable.
+        """
+        is_valid, errors = self.validate_template_structure(template)
+        if not is_valid:
+            raise ValueError(f"Invalid template: {'; '.join(errors)}")
+        
+        current = self.templates.get(exchange)
+        if current is not None and current["version"] != template["version"]:
+            self._archived_templates[(exchange, current["version"])] = current
+        self._archived_templates.pop((exchange, template["version"]), None)
+        self.templates[exchange] = template
+        template_key = (template["exchange"], template["version"])
+        self._forget_derived(lambda key: key == template_key)
+        versions = self.template_versions.setdefault(exchange, [])
+        if template["version"] not in versions:
+            versions.append(template["version"])
+        logger.info(f"Registered {exchange} template version {template['version']}")
+    
+    def update_template(self, exchange: str, template: Dict[str, Any]) -> None:
+        """Replace an existing exchange's template, archiving the previous version."""
+        if exchange not in self.templates:
+            raise ValueError(f"Unsupported exchange: {exchange}")
+        
+        self.create_custom_template(exchange, template)
+    
+    def delete_template(self, exchange: str) -> None:
+        """Remove an exchange's template and all its versions."""
+        if self.templates.pop(exchange, None) is None:
+            raise ValueError(f"Unsupported exchange: {exchange}")
+        
+        self.template_versions.pop(exchange, None)
+        for key in [key for key in self._archived_templates if key[0] == exchange]:
+            del self._archived_templates[key]
+        self._forget_derived(lambda key: key[0] == exchange)
+        logger.info(f"Deleted {exchange} template")
+    
+    def _forget_derived(self, matches: Callable[[Tuple[str, str]], bool]) -> None:
+        """Drop cached frozensets and schemas for matching (exchange, version) keys."""
+        caches = (self._allowed_sets, self._compiled_schema_cache, self._schema_cache)
+        for cache in caches:
+            for key in [key for key in cache if matches(key)]:
+                del cache[key]
@@ -0,0 +1,9 @@
+"""
+Utilities for the crypto tax calculator.
+"""
+
+from .bloom_filter import BloomFilter
+
+__all__ = [
+    "BloomFilter"
+]
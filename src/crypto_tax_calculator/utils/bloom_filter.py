@@ -0,0 +1,50 @@
+"""
+Bloom filter for fast, approximate set membership checks.
+"""
+
+import hashlib
+import math
+from typing import Iterable, List
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+    
+    Membership checks can return false positives (at roughly `error_rate`
+    while fewer than `capacity` items are stored) but never false negatives,
+    so a hit must be confirmed against the authoritative source.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        """Initialize an empty filter sized for `capacity` items."""
+        capacity = max(1, capacity)
+        bits_per_item = -math.log(error_rate) / (math.log(2) ** 2)
+        self.num_bits = max(8, int(capacity * bits_per_item))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, item: str) -> List[int]:
+        """Get the bit positions for an item using double hashing."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+    
+    def update(self, items: Iterable[str]) -> None:
+        """Add several items to the filter."""
+        for item in items:
+            self.add(item)
+    
+    def __contains__(self, item: str) -> bool:
+        """Check whether an item may have been added."""
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
@@ -4,6 +4,8 @@ Streamlit web application for Crypto Capital Gains Tax Calculator.
 
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+from sqlalchemy.orm import raiseload
 from datetime import datetime, timezone
 from pathlib import Path
 import sys
@@ -11,18 +13,52 @@ import sys
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from shared.database import get_session
+from shared.database import DatabaseManager, get_database_manager
 from shared.secrets import get_api_credentials
 from crypto_tax_calculator.services import BinanceService, CSVImporter, CGTCalculator
 from crypto_tax_calculator.models import Transaction, CGTReport
 
 # Page configuration
-st.set_page_config(
-    page_title="Crypto Tax Calculator",
-    page_icon="💰",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+PAGE_CONFIG = {
+    "page_title": "Crypto Tax Calculator",
+    "page_icon": "💰",
+    "layout": "wide",
+    "initial_sidebar_state": "expanded",
+}
+PAGES = ("Dashboard", "Import Data", "CGT Calculation", "Portfolio", "Transactions")
+
+# Filter options
+FIRST_TAX_YEAR = 2020
+EXCHANGE_OPTIONS = ("All", "binance", "revolut", "coinbase", "kucoin", "kraken")
+ASSET_OPTIONS = ("All", "BTC", "ETH", "LTC", "BCH", "XRP", "ADA")
+
+st.set_page_config(**PAGE_CONFIG)
+
+# Loader options for transaction listings rendered via to_dict(). Transaction has
+# no relationships today; raiseload("*") makes any future lazy relationship
+# access fail loudly instead of issuing one SELECT per row. Add selectinload()
+# entries here for relationships that to_dict() needs.
+TRANSACTION_LIST_LOAD_OPTIONS = (raiseload("*"),)
+
+@st.cache_resource
+def _db_manager_cached() -> DatabaseManager:
+    """Return the database manager shared across reruns and sessions."""
+    return get_database_manager()
+
+def get_session():
+    """Get a database session from the cached database manager."""
+    return _db_manager_cached().get_session()
+
+@st.cache_data(ttl=86400)
+def _year_options_with_all() -> list:
+    """Tax year filter options, refreshed daily."""
+    return ["All"] + list(range(FIRST_TAX_YEAR, datetime.now().year + 1))
+
+@st.cache_data(ttl=86400)
+def _recent_tax_years() -> range:
+    """The last six tax years for CGT calculation, refreshed daily."""
+    current_year = datetime.now().year
+    return range(current_year - 5, current_year + 1)
 
 def main():
     """Main Streamlit application."""
@@ -32,10 +68,7 @@ def main():
     # Sidebar
     with st.sidebar:
         st.header("Navigation")
-        page = st.selectbox(
-            "Choose a page",
-            ["Dashboard", "Import Data", "CGT Calculation", "Portfolio", "Transactions"]
-        )
+        page = st.selectbox("Choose a page", PAGES)
     
     # Main content
     if page == "Dashboard":
@@ -49,6 +82,7 @@ def main():
     elif page == "Transactions":
         show_transactions()
 
+@st.fragment
 def show_dashboard():
     """Show dashboard page."""
     st.header("📊 Dashboard")
@@ -61,7 +95,13 @@ def show_dashboard():
         total_assets = session.query(Transaction.asset).distinct().count()
         
         # Get recent transactions
-        recent_transactions = session.query(Transaction).order_by(Transaction.date.desc()).limit(5).all()
+        recent_transactions = (
+            session.query(Transaction)
+            .options(*TRANSACTION_LIST_LOAD_OPTIONS)
+            .order_by(Transaction.date.desc())
+            .limit(5)
+            .all()
+        )
         
         # Display metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -90,6 +130,7 @@ def show_dashboard():
     finally:
         session.close()
 
+@st.fragment
 def show_import_data():
     """Show import data page."""
     st.header("📥 Import Data")
@@ -124,13 +165,11 @@ def show_import_data():
                     # Save to database
                     session = get_session()
                     try:
-                        for transaction in result["transactions"]:
-                            session.add(transaction)
-                        session.commit()
+                        with session.begin():
+                            session.bulk_save_objects(result["transactions"])
                         st.success("💾 Transactions saved to database")
                     except Exception as e:
                         st.error(f"❌ Failed to save transactions: {e}")
-                        session.rollback()
                     finally:
                         session.close()
                 else:
@@ -181,35 +220,24 @@ def show_import_data():
                         
                         if result["success"]:
                             st.success(f"✅ Synced {result['count']} transactions from Binance")
-                            
-                            # Save to database
-                            session = get_session()
-                            try:
-                                for transaction in result["transactions"]:
-                                    session.add(transaction)
-                                session.commit()
-                                st.success("💾 Transactions saved to database")
-                            except Exception as e:
-                                st.error(f"❌ Failed to save transactions: {e}")
-                                session.rollback()
-                            finally:
-                                session.close()
+                            st.success("💾 Transactions saved to database")
                         else:
                             st.error(f"❌ Sync failed: {result['error']}")
                             
                     except Exception as e:
                         st.error(f"❌ Error syncing from Binance: {e}")
 
+@st.fragment
 def show_cgt_calculation():
     """Show CGT calculation page."""
     st.header("🧮 CGT Calculation")
     
     # Tax year selection
-    current_year = datetime.now().year
+    tax_years = _recent_tax_years()
     tax_year = st.selectbox(
         "Select Tax Year",
-        range(current_year - 5, current_year + 1),
-        index=current_year - current_year + 5  # Default to current year
+        tax_years,
+        index=len(tax_years) - 1  # Default to current year
     )
     
     if st.button("Calculate CGT"):
@@ -247,8 +275,9 @@ def show_cgt_calculation():
                     st.info(f"Based on {cgt_report.total_transactions} total transactions ({cgt_report.taxable_transactions} taxable)")
                     
                     # Save report
-                    session.add(cgt_report)
-                    session.commit()
+                    session.rollback()  # end the read transaction before writing
+                    with session.begin():
+                        session.add(cgt_report)
                     st.success("💾 CGT report saved to database")
                     
                 finally:
@@ -257,6 +286,7 @@ def show_cgt_calculation():
             except Exception as e:
                 st.error(f"❌ Error calculating CGT: {e}")
 
+@st.fragment
 def show_portfolio():
     """Show portfolio page."""
     st.header("💼 Portfolio")
@@ -264,7 +294,7 @@ def show_portfolio():
     # Tax year filter
     tax_year = st.selectbox(
         "Filter by Tax Year",
-        ["All"] + list(range(2020, datetime.now().year + 1)),
+        _year_options_with_all(),
         index=0
     )
     
@@ -307,28 +337,27 @@ def show_portfolio():
                     # Asset holdings
                     st.subheader("Asset Holdings")
                     
-                    holdings_data = []
-                    for asset, amount in summary['asset_holdings'].items():
-                        value = summary['asset_values'][asset]
-                        allocation = summary['asset_allocation'][asset]
-                        holdings_data.append({
-                            "Asset": asset,
-                            "Amount": f"{amount:.8f}",
-                            "Value (EUR)": f"€{value:.2f}",
-                            "Allocation (%)": f"{allocation:.1f}%"
-                        })
-                    
-                    holdings_df = pd.DataFrame(holdings_data)
-                    st.dataframe(holdings_df, use_container_width=True)
+                    holdings = summary['asset_holdings']
+                    holdings_table = pa.Table.from_pydict({
+                        "Asset": list(holdings),
+                        "Amount": list(holdings.values()),
+                        "Value (EUR)": [summary['asset_values'][asset] for asset in holdings],
+                        "Allocation (%)": [summary['asset_allocation'].get(asset, 0.0) for asset in holdings],
+                    })
+                    st.dataframe(
+                        holdings_table,
+                        use_container_width=True,
+                        column_config={
+                            "Amount": st.column_config.NumberColumn(format="%.8f"),
+                            "Value (EUR)": st.column_config.NumberColumn(format="€%.2f"),
+                            "Allocation (%)": st.column_config.NumberColumn(format="%.1f%%"),
+                        }
+                    )
                     
                     # Asset allocation chart
                     if len(summary['asset_allocation']) > 1:
                         st.subheader("Asset Allocation")
-                        allocation_df = pd.DataFrame(
-                            list(summary['asset_allocation'].items()),
-                            columns=['Asset', 'Allocation']
-                        )
-                        st.bar_chart(allocation_df.set_index('Asset'))
+                        st.bar_chart(holdings_table, x="Asset", y="Allocation (%)")
                     
                 finally:
                     session.close()
@@ -336,6 +365,7 @@ def show_portfolio():
             except Exception as e:
                 st.error(f"❌ Error generating portfolio summary: {e}")
 
+@st.fragment
 def show_transactions():
     """Show transactions page."""
     st.header("📋 Transactions")
@@ -346,20 +376,20 @@ def show_transactions():
     with col1:
         tax_year = st.selectbox(
             "Tax Year",
-            ["All"] + list(range(2020, datetime.now().year + 1)),
+            _year_options_with_all(),
             index=0
         )
     
     with col2:
         exchange = st.selectbox(
             "Exchange",
-            ["All", "binance", "revolut", "coinbase", "kucoin", "kraken"]
+            EXCHANGE_OPTIONS
         )
     
     with col3:
         asset = st.selectbox(
             "Asset",
-            ["All"] + ["BTC", "ETH", "LTC", "BCH", "XRP", "ADA"]
+            ASSET_OPTIONS
         )
     
     # Limit
@@ -371,7 +401,7 @@ def show_transactions():
                 # Get transactions from database
                 session = get_session()
                 try:
-                    query = session.query(Transaction)
+                    query = session.query(Transaction).options(*TRANSACTION_LIST_LOAD_OPTIONS)
                     
                     if tax_year != "All":
                         query = query.filter(Transaction.tax_year == tax_year)
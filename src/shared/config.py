@@ -4,7 +4,7 @@ Configuration management for the application.
 
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import yaml
 
@@ -29,6 +29,7 @@ def get_config() -> Dict[str, Any]:
             "level": "INFO",
             "format": "json",
             "file": "logs/crypto_tax_calc.log",
+            "audit_file": "logs/audit.log",
             "max_size": "10MB",
             "backup_count": 5,
         },
@@ -97,54 +98,101 @@ def get_config() -> Dict[str, Any]:
 
 
 def _merge_config(default: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-    """Recursively merge configuration dictionaries."""
-    result = default.copy()
+    """Merge configuration dictionaries in a single iterative pass.
     
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _merge_config(result[key], value)
-        else:
-            result[key] = value
+    Only dictionaries present on both sides are copied; everything else is
+    shared with the inputs, which is safe because configuration is read-only
+    once loaded.
+    """
+    result = dict(default)
+    stack = [(result, override)]
+    
+    while stack:
+        target, overrides = stack.pop()
+        for key, value in overrides.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = dict(current)
+                target[key] = merged
+                stack.append((merged, value))
+            else:
+                target[key] = value
     
     return result
 
 
+def _to_int(value: str) -> Any:
+    """Coerce an environment value to int, leaving it unchanged on failure."""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _to_float(value: str) -> Any:
+    """Coerce an environment value to float, leaving it unchanged on failure."""
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _to_bool(value: str) -> bool:
+    """Coerce an environment value to bool."""
+    return value.lower() in ("true", "1", "yes", "on")
+
+
+def _to_str(value: str) -> str:
+    """Return an environment value unchanged."""
+    return value
+
+
+_ENV_MAPPINGS = {
+    "CRYPTO_TAX_DB_TYPE": ("database", "type"),
+    "CRYPTO_TAX_DB_PATH": ("database", "path"),
+    "CRYPTO_TAX_DB_HOST": ("database", "host"),
+    "CRYPTO_TAX_DB_PORT": ("database", "port"),
+    "CRYPTO_TAX_DB_NAME": ("database", "database"),
+    "CRYPTO_TAX_DB_USER": ("database", "username"),
+    "CRYPTO_TAX_DB_PASSWORD": ("database", "password"),
+    "CRYPTO_TAX_BINANCE_API_KEY": ("binance", "api_key"),
+    "CRYPTO_TAX_BINANCE_API_SECRET": ("binance", "api_secret"),
+    "CRYPTO_TAX_LOG_LEVEL": ("logging", "level"),
+    "CRYPTO_TAX_LOG_FILE": ("logging", "file"),
+    "CRYPTO_TAX_WEB_HOST": ("web", "host"),
+    "CRYPTO_TAX_WEB_PORT": ("web", "port"),
+}
+
+_INT_KEYS = frozenset({"port", "rate_limit", "timeout", "backup_retention_days"})
+_FLOAT_KEYS = frozenset({"tax_rate"})
+_BOOL_KEYS = frozenset({"echo", "debug", "enabled"})
+
+
+def _converter_for(key: str) -> Callable[[str], Any]:
+    """Pick the value converter for a configuration key."""
+    if key in _INT_KEYS:
+        return _to_int
+    if key in _FLOAT_KEYS:
+        return _to_float
+    if key in _BOOL_KEYS:
+        return _to_bool
+    return _to_str
+
+
+# (env_var, section, key, converter) resolved once at import time
+_ENV_SPECS: Tuple[Tuple[str, str, str, Callable[[str], Any]], ...] = tuple(
+    (env_var, section, key, _converter_for(key))
+    for env_var, (section, key) in _ENV_MAPPINGS.items()
+)
+
+
 def _apply_env_overrides(config: Dict[str, Any]) -> Dict[str, Any]:
     """Apply environment variable overrides to configuration."""
-    env_mappings = {
-        "CRYPTO_TAX_DB_TYPE": ("database", "type"),
-        "CRYPTO_TAX_DB_PATH": ("database", "path"),
-        "CRYPTO_TAX_DB_HOST": ("database", "host"),
-        "CRYPTO_TAX_DB_PORT": ("database", "port"),
-        "CRYPTO_TAX_DB_NAME": ("database", "database"),
-        "CRYPTO_TAX_DB_USER": ("database", "username"),
-        "CRYPTO_TAX_DB_PASSWORD": ("database", "password"),
-        "CRYPTO_TAX_BINANCE_API_KEY": ("binance", "api_key"),
-        "CRYPTO_TAX_BINANCE_API_SECRET": ("binance", "api_secret"),
-        "CRYPTO_TAX_LOG_LEVEL": ("logging", "level"),
-        "CRYPTO_TAX_LOG_FILE": ("logging", "file"),
-        "CRYPTO_TAX_WEB_HOST": ("web", "host"),
-        "CRYPTO_TAX_WEB_PORT": ("web", "port"),
-    }
-    
-    for env_var, (section, key) in env_mappings.items():
-        value = os.getenv(env_var)
+    environ = os.environ
+    for env_var, section, key, convert in _ENV_SPECS:
+        value = environ.get(env_var)
         if value is not None:
-            # Convert numeric values
-            if key in ["port", "rate_limit", "timeout", "backup_retention_days"]:
-                try:
-                    value = int(value)
-                except ValueError:
-                    pass
-            elif key in ["tax_rate"]:
-                try:
-                    value = float(value)
-                except ValueError:
-                    pass
-            elif key in ["echo", "debug", "enabled"]:
-                value = value.lower() in ("true", "1", "yes", "on")
-            
-            config[section][key] = value
+            config[section][key] = convert(value)
     
     return config
 
@@ -6,7 +6,7 @@ import os
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, event, Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.declarative import declarative_base
@@ -16,6 +16,24 @@ from .config import get_config
 # Create Base class for models
 Base = declarative_base()
 
+# Applied to every new SQLite connection: WAL lets readers proceed during
+# writes and NORMAL sync avoids an fsync per commit in WAL mode.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure SQLite connection pragmas."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 class DatabaseManager:
     """Manages database connections and sessions."""
@@ -45,6 +63,9 @@ class DatabaseManager:
             })
         
         self.engine = create_engine(database_url, **engine_kwargs)
+        
+        if database_url.startswith("sqlite"):
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
         self.SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
@@ -2,23 +2,67 @@
 Logging configuration for structured JSON logging.
 """
 
+import atexit
+import copy
+import itertools
 import json
 import logging
 import logging.handlers
-from datetime import datetime
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, List, Optional
+
+import orjson
 
 from .config import get_config
 
 
+# LogRecord attributes that are not user-supplied extras
+_RESERVED_LOGRECORD_ATTRS = frozenset({
+    "name", "msg", "args", "levelname", "levelno", "pathname",
+    "filename", "module", "lineno", "funcName", "created",
+    "msecs", "relativeCreated", "thread", "threadName",
+    "processName", "process", "getMessage", "exc_info",
+    "exc_text", "stack_info", "message"
+})
+
+
+# Most recently formatted second as (epoch_second, "YYYY-MM-DDTHH:MM:SS")
+_last_timestamp_second = (-1, "")
+
+
+def _fast_iso_utc(created: float) -> str:
+    """Format an epoch timestamp as ISO 8601 UTC with microseconds.
+    
+    Records arrive in bursts within the same second, so the date/time
+    prefix is cached and only the fractional part is formatted per call.
+    """
+    global _last_timestamp_second
+    second = int(created)
+    cached_second, prefix = _last_timestamp_second
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _last_timestamp_second = (second, prefix)
+    return "%s.%06dZ" % (prefix, int((created - second) * 1_000_000))
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
+        return self.serialize(record).decode()
+    
+    def serialize(self, record: logging.LogRecord) -> bytes:
+        """Serialize log record to UTF-8 JSON bytes."""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _fast_iso_utc(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,19 +74,228 @@ class JSONFormatter(logging.Formatter):
         # Add exception info if present
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_entry["exception"] = record.exc_text
         
         # Add extra fields
-        for key, value in record.__dict__.items():
-            if key not in {
-                "name", "msg", "args", "levelname", "levelno", "pathname",
-                "filename", "module", "lineno", "funcName", "created",
-                "msecs", "relativeCreated", "thread", "threadName",
-                "processName", "process", "getMessage", "exc_info",
-                "exc_text", "stack_info"
-            }:
-                log_entry[key] = value
+        log_entry |= {
+            key: value for key, value in record.__dict__.items()
+            if key not in _RESERVED_LOGRECORD_ATTRS
+        }
         
-        return json.dumps(log_entry, default=str)
+        try:
+            return orjson.dumps(
+                log_entry,
+                default=str,
+                option=(
+                    orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+                ),
+            )
+        except TypeError:
+            # orjson rejects what json handles, e.g. ints beyond 64 bits
+            return json.dumps(log_entry, default=str).encode()
+
+
+# Renders tracebacks before records cross to the listener thread
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves JSON formatting to the listener thread.
+    
+    The stock QueueHandler formats each record on the calling thread and
+    folds the traceback into the message. This only resolves the message
+    and renders the traceback text, so the structured fields survive.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make the record safe to hand to another thread."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class AsyncRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that finishes rollovers on a background thread.
+    
+    The writer only renames the full log aside and reopens the base file;
+    shifting the numbered backups and the final rename (plus any namer or
+    rotator, e.g. compression) run on a single worker, in rollover order.
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize handler with a single-worker rollover executor."""
+        self._rollover_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log-rollover"
+        )
+        self._rollover_ids = itertools.count()
+        super().__init__(*args, **kwargs)
+    
+    def doRollover(self) -> None:
+        """Move the current file aside and queue the backup rotation."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if self.backupCount > 0 and os.path.exists(self.baseFilename):
+            pending = "%s.rotating%d" % (self.baseFilename, next(self._rollover_ids))
+            os.rename(self.baseFilename, pending)
+            self._rollover_executor.submit(self._finish_rollover, pending)
+        if not self.delay:
+            self.stream = self._open()
+    
+    def _finish_rollover(self, pending: str) -> None:
+        """Shift numbered backups and move the pending file into slot 1."""
+        try:
+            for i in range(self.backupCount - 1, 0, -1):
+                source = self.rotation_filename("%s.%d" % (self.baseFilename, i))
+                dest = self.rotation_filename("%s.%d" % (self.baseFilename, i + 1))
+                if os.path.exists(source):
+                    if os.path.exists(dest):
+                        os.remove(dest)
+                    os.rename(source, dest)
+            dest = self.rotation_filename(self.baseFilename + ".1")
+            if os.path.exists(dest):
+                os.remove(dest)
+            self.rotate(pending, dest)
+        except Exception:
+            if logging.raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+    
+    def close(self) -> None:
+        """Close the file and wait for queued rollovers to finish."""
+        super().close()
+        self._rollover_executor.shutdown(wait=True)
+
+
+class BatchRotatingFileHandler(AsyncRotatingFileHandler):
+    """Rotating file handler that writes many records in one call.
+    
+    The log file is opened in binary mode and records are serialized into
+    a reusable buffer, so JSON output from orjson is written without being
+    decoded to str and re-encoded per record.
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize handler with an empty write buffer."""
+        self._buffer = bytearray()
+        super().__init__(*args, **kwargs)
+    
+    def _open(self):
+        """Open the log file in binary append mode."""
+        return open(self.baseFilename, self.mode + "b")
+    
+    def _serialize(self, record: logging.LogRecord) -> bytes:
+        """Serialize a record, using the formatter's bytes path if it has one."""
+        serialize = getattr(self.formatter, "serialize", None)
+        if serialize is not None:
+            return serialize(record)
+        return self.format(record).encode("utf-8")
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a single record."""
+        self.emit_batch([record])
+    
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Serialize records and write them with a single write and flush."""
+        self.acquire()
+        try:
+            buffer = self._serialize_batch(records)
+            if buffer:
+                self._write_buffer(buffer, records[-1])
+        finally:
+            self.release()
+    
+    def _serialize_batch(self, records: List[logging.LogRecord]) -> bytearray:
+        """Serialize the records that pass the filters into the reusable buffer."""
+        buffer = self._buffer
+        buffer.clear()
+        for record in records:
+            if not self.filter(record):
+                continue
+            try:
+                buffer += self._serialize(record)
+                buffer += b"\n"
+            except Exception:
+                self.handleError(record)
+        return buffer
+    
+    def _write_buffer(self, buffer: bytearray, record: logging.LogRecord) -> None:
+        """Write a serialized batch, rolling the file over first if it is full."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0:
+                position = self.stream.tell()
+                if position and position + len(buffer) >= self.maxBytes:
+                    self.doRollover()
+            self.stream.write(buffer)
+            self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class BatchMemoryHandler(logging.handlers.MemoryHandler):
+    """Memory handler that hands its whole buffer to the target at once."""
+    
+    def flush(self) -> None:
+        """Write buffered records to a BatchRotatingFileHandler target."""
+        self.acquire()
+        try:
+            if self.target and self.buffer:
+                self.target.emit_batch(self.buffer)
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+class PeriodicFlusher(threading.Thread):
+    """Daemon thread that flushes a buffering handler at a fixed interval."""
+    
+    def __init__(self, handler: logging.Handler, interval: float):
+        """Initialize flusher for a handler."""
+        super().__init__(name="log-flusher", daemon=True)
+        self.handler = handler
+        self.interval = interval
+        self._stopped = threading.Event()
+    
+    def run(self) -> None:
+        """Flush the handler until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.handler.flush()
+    
+    def stop(self) -> None:
+        """Stop flushing and wait for the thread to exit."""
+        self._stopped.set()
+        self.join()
+
+
+# Records buffered before a write, and the longest a record may sit unwritten
+LOG_BUFFER_CAPACITY = 1024
+LOG_FLUSH_INTERVAL = 0.2
+
+# Background pipeline that owns the file handler
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_log_flusher: Optional[PeriodicFlusher] = None
+_file_handler: Optional[logging.Handler] = None
+
+
+def _stop_queue_listener() -> None:
+    """Stop the background log pipeline, flushing queued records."""
+    global _queue_listener, _log_flusher, _file_handler
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _log_flusher.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _file_handler.close()
+        _queue_listener = _log_flusher = _file_handler = None
+
+
+atexit.register(_stop_queue_listener)
 
 
 def setup_logging() -> None:
@@ -61,9 +314,11 @@ def setup_logging() -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
-    # Remove existing handlers
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    # Remove existing handlers, draining the background pipeline first
+    _stop_queue_listener()
+    for handler in list(root_logger.handlers):
+        handler.close()
+    root_logger.handlers.clear()
     
     # Console handler
     console_handler = logging.StreamHandler()
@@ -77,20 +332,46 @@ def setup_logging() -> None:
     root_logger.addHandler(console_handler)
     
     # File handler with JSON formatting
-    file_handler = logging.handlers.RotatingFileHandler(
+    file_handler = BatchRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=log_config.get("backup_count", 5)
     )
     file_handler.setLevel(level)
     file_handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(file_handler)
+    
+    # Buffer records so they reach the file in batches; errors flush at once
+    memory_handler = BatchMemoryHandler(
+        capacity=LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+    )
+    memory_handler.setLevel(level)
+    
+    # Serialize and write on a background thread; callers only enqueue
+    global _queue_listener, _log_flusher, _file_handler
+    log_queue: queue.Queue = queue.Queue(-1)
+    _file_handler = file_handler
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, memory_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+    _log_flusher = PeriodicFlusher(memory_handler, LOG_FLUSH_INTERVAL)
+    _log_flusher.start()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    root_logger.addHandler(queue_handler)
     
     # Set specific logger levels
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
     logging.getLogger("binance").setLevel(logging.INFO)
     
+    _configure_audit_logger(
+        Path(log_config.get("audit_file", "logs/audit.log")),
+        log_config.get("backup_count", 5)
+    )
+    
     # Log configuration
     logger = logging.getLogger(__name__)
     logger.info("Logging configured", extra={
@@ -106,76 +387,142 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+# Loggers used by the structured logging helpers below
+_TASK_LOGGER = logging.getLogger("task")
+_API_LOGGER = logging.getLogger("api")
+_DATA_LOGGER = logging.getLogger("data")
+_CGT_LOGGER = logging.getLogger("cgt")
+# Audit records must survive a quiet log level, so the audit logger keeps its
+# own INFO level and, once configured, its own handler
+_AUDIT_LOGGER = logging.getLogger("audit")
+_AUDIT_LOGGER.setLevel(logging.INFO)
+
+
+def _configure_audit_logger(audit_file: Path, backup_count: int) -> None:
+    """Write audit records to their own JSON file, whatever the log level."""
+    for handler in list(_AUDIT_LOGGER.handlers):
+        handler.close()
+    _AUDIT_LOGGER.handlers.clear()
+    
+    audit_file.parent.mkdir(parents=True, exist_ok=True)
+    audit_handler = BatchRotatingFileHandler(
+        audit_file,
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=backup_count
+    )
+    audit_handler.setLevel(logging.INFO)
+    audit_handler.setFormatter(JSONFormatter())
+    _AUDIT_LOGGER.addHandler(audit_handler)
+    # Root handlers are filtered by the configured level; keep audit off them
+    _AUDIT_LOGGER.propagate = False
+
+
 def log_task_start(task_id: str, task_name: str, **kwargs) -> None:
     """Log task start."""
-    logger = get_logger("task")
-    logger.info(f"Task {task_id} started: {task_name}", extra={
+    if not _TASK_LOGGER.isEnabledFor(logging.INFO):
+        return
+    extra = {
         "task_id": task_id,
         "task_name": task_name,
-        "status": "started",
-        **kwargs
-    })
+        "status": "started"
+    }
+    extra.update(kwargs)
+    _TASK_LOGGER.info("Task %s started: %s", task_id, task_name, extra=extra)
 
 
 def log_task_complete(task_id: str, task_name: str, duration: float, **kwargs) -> None:
     """Log task completion."""
-    logger = get_logger("task")
-    logger.info(f"Task {task_id} completed: {task_name}", extra={
+    if not _TASK_LOGGER.isEnabledFor(logging.INFO):
+        return
+    extra = {
         "task_id": task_id,
         "task_name": task_name,
         "status": "completed",
-        "duration_seconds": duration,
-        **kwargs
-    })
+        "duration_seconds": duration
+    }
+    extra.update(kwargs)
+    _TASK_LOGGER.info("Task %s completed: %s", task_id, task_name, extra=extra)
 
 
 def log_task_error(task_id: str, task_name: str, error: Exception, **kwargs) -> None:
     """Log task error."""
-    logger = get_logger("task")
-    logger.error(f"Task {task_id} failed: {task_name}", extra={
+    if not _TASK_LOGGER.isEnabledFor(logging.ERROR):
+        return
+    extra = {
         "task_id": task_id,
         "task_name": task_name,
         "status": "failed",
         "error_type": type(error).__name__,
-        "error_message": str(error),
-        **kwargs
-    }, exc_info=True)
+        "error_message": str(error)
+    }
+    extra.update(kwargs)
+    _TASK_LOGGER.error(
+        "Task %s failed: %s", task_id, task_name, extra=extra, exc_info=True
+    )
 
 
-def log_api_call(service: str, endpoint: str, method: str, status_code: int, 
+def log_api_call(service: str, endpoint: str, method: str, status_code: int,
                  duration: float, **kwargs) -> None:
     """Log API call."""
-    logger = get_logger("api")
-    logger.info(f"API call: {method} {endpoint}", extra={
+    if not _API_LOGGER.isEnabledFor(logging.INFO):
+        return
+    extra = {
         "service": service,
         "endpoint": endpoint,
         "method": method,
         "status_code": status_code,
-        "duration_seconds": duration,
-        **kwargs
-    })
+        "duration_seconds": duration
+    }
+    extra.update(kwargs)
+    _API_LOGGER.info("API call: %s %s", method, endpoint, extra=extra)
 
 
 def log_data_operation(operation: str, table: str, count: int, **kwargs) -> None:
     """Log data operation."""
-    logger = get_logger("data")
-    logger.info(f"Data operation: {operation}", extra={
+    if not _DATA_LOGGER.isEnabledFor(logging.INFO):
+        return
+    extra = {
         "operation": operation,
         "table": table,
-        "record_count": count,
-        **kwargs
-    })
+        "record_count": count
+    }
+    extra.update(kwargs)
+    _DATA_LOGGER.info("Data operation: %s", operation, extra=extra)
+
+
+def log_audit_record(operation: str, table: str, count: int, **kwargs) -> None:
+    """Log an audit record.
+    
+    The audit logger has its own level and handler, so records are written
+    at INFO even when the configured log level is higher.
+    """
+    extra = {
+        "operation": operation,
+        "table": table,
+        "record_count": count
+    }
+    extra.update(kwargs)
+    _AUDIT_LOGGER.info("Audit: %s", operation, extra=extra)
 
 
 def log_cgt_calculation(tax_year: int, total_gains: float, total_losses: float,
-                       tax_due: float, **kwargs) -> None:
-    """Log CGT calculation."""
-    logger = get_logger("cgt")
-    logger.info(f"CGT calculation for {tax_year}", extra={
+                        tax_due: float, *, net_gains: Optional[float] = None,
+                        **kwargs) -> None:
+    """Log CGT calculation.
+    
+    Pass net_gains when the caller already has it; otherwise it is derived
+    as total_gains - total_losses.
+    """
+    if not _CGT_LOGGER.isEnabledFor(logging.INFO):
+        return
+    if net_gains is None:
+        net_gains = total_gains - total_losses
+    extra = {
         "tax_year": tax_year,
         "total_gains": total_gains,
         "total_losses": total_losses,
-        "net_gains": total_gains - total_losses,
-        "tax_due": tax_due,
-        **kwargs
-    })
+        "net_gains": net_gains,
+        "tax_due": tax_due
+    }
+    extra.update(kwargs)
+    _CGT_LOGGER.info("CGT calculation for %s", tax_year, extra=extra)
@@ -7,63 +7,107 @@ import os
 from pathlib import Path
 from typing import Optional
 
+import orjson
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# AES-GCM nonce size in bytes (96 bits, as recommended for GCM)
+AESGCM_NONCE_SIZE = 12
+
+
+def _write_private_file(path: Path, data: bytes) -> None:
+    """Write data to a file that is created with owner-only permissions."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 class SecretsManager:
     """Manages encryption and decryption of sensitive data."""
     
-    def __init__(self, encryption_key: Optional[str] = None):
-        """Initialize secrets manager with encryption key."""
+    def __init__(self, encryption_key: Optional[str] = None, use_aesgcm: bool = False):
+        """Initialize secrets manager with encryption key.
+        
+        With use_aesgcm, secrets are sealed with AES-256-GCM instead of Fernet.
+        The two schemes use separate key and secrets files, so switching modes
+        requires storing the secrets again.
+        """
+        self.use_aesgcm = use_aesgcm
+        if use_aesgcm:
+            self._key_file = Path("data/.encryption_key_aesgcm")
+            self._secrets_file = Path("data/.secrets_aesgcm")
+        else:
+            self._key_file = Path("data/.encryption_key")
+            self._secrets_file = Path("data/.secrets")
+        
         self.encryption_key = encryption_key or self._get_or_create_key()
-        self.cipher = Fernet(self.encryption_key)
+        if use_aesgcm:
+            self.cipher = AESGCM(self.encryption_key)
+        else:
+            self.cipher = Fernet(self.encryption_key)
+        
+        # Parsed secrets file, valid while the file's mtime is unchanged
+        self._cache: Optional[dict] = None
+        self._cache_mtime = 0
+        
+        # Decrypted values as key -> (ciphertext, plaintext)
+        self._decrypted: dict = {}
     
     def _get_or_create_key(self) -> str:
         """Get or create encryption key."""
-        key_file = Path("data/.encryption_key")
+        key_file = self._key_file
         
         if key_file.exists():
-            with open(key_file, "rb") as f:
-                return f.read()
+            return key_file.read_bytes()
         
         # Create new key
-        key = Fernet.generate_key()
+        if self.use_aesgcm:
+            key = AESGCM.generate_key(bit_length=256)
+        else:
+            key = Fernet.generate_key()
         
         # Ensure data directory exists
         key_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Save key securely
-        with open(key_file, "wb") as f:
-            f.write(key)
-        
-        # Set restrictive permissions
-        key_file.chmod(0o600)
+        _write_private_file(key_file, key)
         
         return key
     
     def encrypt(self, data: str) -> str:
         """Encrypt sensitive data."""
-        encrypted_data = self.cipher.encrypt(data.encode())
+        if self.use_aesgcm:
+            nonce = os.urandom(AESGCM_NONCE_SIZE)
+            encrypted_data = nonce + self.cipher.encrypt(nonce, data.encode(), None)
+        else:
+            encrypted_data = self.cipher.encrypt(data.encode())
         return base64.b64encode(encrypted_data).decode()
     
     def decrypt(self, encrypted_data: str) -> str:
         """Decrypt sensitive data."""
         try:
             decoded_data = base64.b64decode(encrypted_data.encode())
-            decrypted_data = self.cipher.decrypt(decoded_data)
+            if self.use_aesgcm:
+                nonce = decoded_data[:AESGCM_NONCE_SIZE]
+                ciphertext = decoded_data[AESGCM_NONCE_SIZE:]
+                decrypted_data = self.cipher.decrypt(nonce, ciphertext, None)
+            else:
+                decrypted_data = self.cipher.decrypt(decoded_data)
             return decrypted_data.decode()
         except Exception as e:
             raise ValueError(f"Failed to decrypt data: {e}")
     
     def store_secret(self, key: str, value: str) -> None:
         """Store encrypted secret."""
-        secrets_file = Path("data/.secrets")
-        secrets = self._load_secrets()
+        secrets = dict(self._load_secrets())
         
         secrets[key] = self.encrypt(value)
         self._save_secrets(secrets)
+        self._decrypted.clear()
     
     def get_secret(self, key: str) -> Optional[str]:
         """Get decrypted secret."""
@@ -73,45 +117,64 @@ class SecretsManager:
         if encrypted_value is None:
             return None
         
+        # The ciphertext changes whenever the secret does, so it validates the entry
+        cached = self._decrypted.get(key)
+        if cached is not None and cached[0] == encrypted_value:
+            return cached[1]
+        
         try:
-            return self.decrypt(encrypted_value)
+            value = self.decrypt(encrypted_value)
         except ValueError:
             return None
+        
+        self._decrypted[key] = (encrypted_value, value)
+        return value
     
     def delete_secret(self, key: str) -> None:
         """Delete secret."""
         secrets = self._load_secrets()
         if key in secrets:
+            secrets = dict(secrets)
             del secrets[key]
             self._save_secrets(secrets)
+            self._decrypted.clear()
     
     def _load_secrets(self) -> dict:
-        """Load secrets from file."""
-        secrets_file = Path("data/.secrets")
+        """Load secrets from file, reusing the parsed copy if unchanged.
+        
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        secrets_file = self._secrets_file
         
-        if not secrets_file.exists():
+        try:
+            mtime = secrets_file.stat().st_mtime_ns
+        except OSError:
+            self._cache = None
             return {}
         
+        if self._cache is not None and mtime == self._cache_mtime:
+            return self._cache
+        
         try:
-            import json
-            with open(secrets_file, "r") as f:
-                return json.load(f)
+            secrets = orjson.loads(secrets_file.read_bytes())
         except Exception:
             return {}
+        
+        self._cache = secrets
+        self._cache_mtime = mtime
+        return secrets
     
     def _save_secrets(self, secrets: dict) -> None:
         """Save secrets to file."""
-        secrets_file = Path("data/.secrets")
+        secrets_file = self._secrets_file
         
         # Ensure data directory exists
         secrets_file.parent.mkdir(parents=True, exist_ok=True)
         
-        import json
-        with open(secrets_file, "w") as f:
-            json.dump(secrets, f, indent=2)
+        _write_private_file(secrets_file, orjson.dumps(secrets, option=orjson.OPT_INDENT_2))
         
-        # Set restrictive permissions
-        secrets_file.chmod(0o600)
+        self._cache = secrets
+        self._cache_mtime = secrets_file.stat().st_mtime_ns
 
 
 # Global secrets manager instance
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the Binance contract tests.
+"""
+
+import orjson
+import pytest
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class Spy:
+    """Stand-in for a patched method that returns a canned value and counts calls."""
+    
+    __slots__ = ("returns", "count", "args")
+    
+    def __init__(self, returns: Any = None):
+        self.returns = returns
+        self.count = 0
+        self.args: Optional[Tuple[Any, ...]] = None
+    
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.count += 1
+        self.args = args
+        return self.returns
+    
+    def assert_called_once(self) -> None:
+        """Fail unless the spy was called exactly once."""
+        assert self.count == 1, f"expected one call, got {self.count}"
+
+
+def _frozen(payload: Any) -> Any:
+    """Make a JSON-like payload read-only so it can be shared across tests."""
+    if isinstance(payload, dict):
+        return MappingProxyType({key: _frozen(value) for key, value in payload.items()})
+    if isinstance(payload, list):
+        return tuple(_frozen(item) for item in payload)
+    return payload
+
+
+@pytest.fixture(scope="session")
+def binance_payloads() -> Dict[str, Any]:
+    """Canned Binance API payloads from fixtures/*.json, keyed by file stem.
+    
+    The files are parsed once per session.
+    """
+    return {
+        path.stem: _frozen(orjson.loads(path.read_bytes()))
+        for path in sorted(FIXTURES_DIR.glob("*.json"))
+    }
+
+
+@pytest.fixture
+def spy() -> Spy:
+    """A fresh call-counting spy to monkeypatch over a service method."""
+    return Spy()
@@ -21,7 +21,8 @@ class TestBinanceAPIStatus:
         return BinanceService(
             api_key="test_key",
             api_secret="test_secret",
-            base_url="https://api.binance.com"
+            base_url="https://api.binance.com",
+            eager_connect=False
         )
 
     def test_check_api_status_success(self, binance_service):
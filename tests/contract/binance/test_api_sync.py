@@ -13,15 +13,28 @@ Test Categories:
 - Data Storage and Audit Trail
 """
 
+import hashlib
+import hmac
+import json
+import logging
+import orjson
 import pytest
+import threading
+import time
+import websockets
 from datetime import datetime, timezone
 from decimal import Decimal
+from itertools import islice
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import List, Dict, Any
 from unittest.mock import Mock, patch
 
-from crypto_tax_calculator.services.binance_service import BinanceService
+from crypto_tax_calculator.services import binance_service as service_module
+from crypto_tax_calculator.services.binance_service import BinanceService, TokenBucket
 from crypto_tax_calculator.models.transaction import Transaction
 from crypto_tax_calculator.models.asset import Asset
+from crypto_tax_calculator.utils import BloomFilter
+from shared import logging_config
 
 
 class TestBinanceAPISync:
@@ -30,11 +43,20 @@ class TestBinanceAPISync:
     @pytest.fixture
     def binance_service(self):
         """Create a Binance service instance for testing."""
-        return BinanceService(
+        service = BinanceService(
             api_key="test_key",
             api_secret="test_secret",
-            base_url="https://api.binance.com"
+            base_url="https://api.binance.com",
+            eager_connect=False
         )
+        # Inject the exchangeInfo symbol map so normalization stays offline
+        service._symbol_map.update({
+            "BTCUSDT": ("BTC", "USDT"),
+            "ETHBTC": ("ETH", "BTC"),
+            "BNBEUR": ("BNB", "EUR"),
+            "ADABUSD": ("ADA", "BUSD"),
+        })
+        return service
     
     @pytest.fixture
     def sample_binance_trade(self):
@@ -95,17 +117,33 @@ class TestBinanceAPISync:
         assert binance_service.base_url == "https://api.binance.com"
         assert binance_service.rate_limiter is not None
         assert binance_service.session is not None
+        assert binance_service.session.get_adapter("https://")._pool_maxsize >= 100
 
-    def test_authenticate_api_credentials(self, binance_service):
-        """Test API authentication with valid credentials."""
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = {"serverTime": 1640995200000}
-            
-            result = binance_service.authenticate()
+    def test_eager_connect_warms_connection(self):
+        """Test that eager_connect issues a background /api/v3/time request."""
+        warmed = threading.Event()
+        
+        with patch.object(
+            BinanceService, '_make_request', side_effect=lambda *args: warmed.set()
+        ) as mock_request:
+            BinanceService(
+                api_key="test_key", api_secret="test_secret", eager_connect=True
+            )
             
-            assert result is True
+            assert warmed.wait(timeout=5)
             mock_request.assert_called_once_with("GET", "/api/v3/time")
 
+    def test_authenticate_api_credentials(self, binance_service, spy, monkeypatch):
+        """Test API authentication with valid credentials."""
+        spy.returns = {"serverTime": 1640995200000}
+        monkeypatch.setattr(binance_service, "_make_request", spy)
+        
+        result = binance_service.authenticate()
+        
+        assert result is True
+        spy.assert_called_once()
+        assert spy.args == ("GET", "/api/v3/time")
+
     def test_authenticate_invalid_credentials(self, binance_service):
         """Test API authentication with invalid credentials."""
         binance_service.api_key = "invalid_key"
@@ -118,7 +156,7 @@ class TestBinanceAPISync:
             
             assert result is False
 
-    def test_fetch_account_info(self, binance_service):
+    def test_fetch_account_info(self, binance_service, spy, monkeypatch):
         """Test fetching account information."""
         mock_response = {
             "makerCommission": 15,
@@ -136,45 +174,32 @@ class TestBinanceAPISync:
             ]
         }
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            result = binance_service.get_account_info()
-            
-            assert result == mock_response
-            mock_request.assert_called_once_with("GET", "/api/v3/account")
+        spy.returns = mock_response
+        monkeypatch.setattr(binance_service, "_make_request", spy)
+        
+        result = binance_service.get_account_info()
+        
+        assert result == mock_response
+        spy.assert_called_once()
+        assert spy.args[:2] == ("GET", "/api/v3/account")
 
     def test_fetch_trade_history_with_pagination(self, binance_service):
         """Test fetching trade history with pagination support."""
-        # Mock first page response
-        first_page = {
-            "trades": [
-                {
-                    "symbol": "BTCUSDT",
-                    "id": 1,
-                    "price": "50000.00000000",
-                    "qty": "0.00100000",
-                    "time": 1640995200000,
-                    "isBuyer": True
-                }
-            ],
-            "hasMore": True
-        }
+        # Mock first page response: a full page of 1000 trades
+        first_page = [
+            {
+                "symbol": "BTCUSDT",
+                "id": trade_id,
+                "price": "50000.00000000",
+                "qty": "0.00100000",
+                "time": 1640995200000 + trade_id,
+                "isBuyer": True
+            }
+            for trade_id in range(1, 1001)
+        ]
         
-        # Mock second page response
-        second_page = {
-            "trades": [
-                {
-                    "symbol": "BTCUSDT", 
-                    "id": 2,
-                    "price": "51000.00000000",
-                    "qty": "0.00200000",
-                    "time": 1640995260000,
-                    "isBuyer": False
-                }
-            ],
-            "hasMore": False
-        }
+        # Mock second page response: no trades past the cursor
+        second_page = []
         
         with patch.object(binance_service, '_make_request') as mock_request:
             mock_request.side_effect = [first_page, second_page]
@@ -185,12 +210,103 @@ class TestBinanceAPISync:
                 end_time=datetime(2022, 1, 2, tzinfo=timezone.utc)
             )
             
-            assert len(trades) == 2
+            assert len(trades) == 1000
             assert trades[0]["id"] == 1
-            assert trades[1]["id"] == 2
+            assert trades[-1]["id"] == 1000
             assert mock_request.call_count == 2
+            
+            second_call_params = mock_request.call_args_list[1][0][2]
+            assert second_call_params["fromId"] == first_page[-1]["id"] + 1
+            assert second_call_params["limit"] == 1000
 
-    def test_fetch_deposit_history(self, binance_service):
+    def test_iter_trade_history_is_streaming(self, binance_service, spy, monkeypatch):
+        """Test that iterating trade history only fetches pages as they are consumed."""
+        full_page = [
+            {"symbol": "BTCUSDT", "id": trade_id, "time": 1640995200000 + trade_id}
+            for trade_id in range(1, 1001)
+        ]
+        
+        spy.returns = full_page
+        monkeypatch.setattr(binance_service, "_make_request", spy)
+        
+        first_trades = list(
+            islice(binance_service.iter_trade_history(symbol="BTCUSDT"), 1)
+        )
+        
+        assert first_trades[0]["id"] == 1
+        spy.assert_called_once()
+
+    def test_fetch_trade_history_multi_symbol_concurrently(self, binance_service):
+        """Test fetching trade history for many symbols in parallel."""
+        symbols = [f"COIN{i}USDT" for i in range(20)]
+        request_latency = 0.1
+        
+        def fake_request(method, endpoint, params):
+            time.sleep(request_latency)
+            if params.get("fromId"):
+                return []
+            return [
+                {
+                    "symbol": params["symbol"],
+                    "id": trade_id,
+                    "time": 1640995200000 + trade_id,
+                }
+                for trade_id in (1, 2)
+            ]
+        
+        with patch.object(
+            binance_service, '_make_request', side_effect=fake_request
+        ) as mock_request:
+            start = time.monotonic()
+            trades = binance_service.get_trade_history_multi(symbols, limit=2)
+            elapsed = time.monotonic() - start
+            
+            assert set(trades) == set(symbols)
+            assert all(len(symbol_trades) == 2 for symbol_trades in trades.values())
+            assert mock_request.call_count == 40
+            
+            # Two pages per symbol: sequentially this would take 40 request latencies
+            single_symbol_time = 2 * request_latency
+            assert elapsed < 4 * single_symbol_time
+
+    @pytest.mark.asyncio
+    async def test_stream_trades_via_websocket(self, binance_service, monkeypatch):
+        """Test that trades stream over a websocket that reconnects with backoff."""
+        base_delay = 0.05
+        monkeypatch.setattr(service_module, "STREAM_RECONNECT_BASE_DELAY", base_delay)
+        trades = [
+            {"e": "trade", "s": "BTCUSDT", "t": trade_id, "p": "50000.00", "q": "0.001"}
+            for trade_id in (1, 2)
+        ]
+        connection_paths = []
+        connection_times = []
+        
+        async def handler(websocket):
+            connection_paths.append(websocket.request.path)
+            connection_times.append(time.monotonic())
+            # Drop the first two connections to force reconnects
+            if len(connection_paths) < 3:
+                return
+            for trade in trades:
+                await websocket.send(json.dumps(trade))
+            await websocket.wait_closed()
+        
+        async with websockets.serve(handler, "127.0.0.1", 0) as server:
+            binance_service.stream_url = (
+                f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+            )
+            stream = binance_service.stream_trades("BTCUSDT")
+            received = [await anext(stream) for _ in trades]
+            await stream.aclose()
+        
+        assert received == trades
+        assert connection_paths == ["/btcusdt@trade"] * 3
+        
+        # The wait before each reconnect doubles
+        assert connection_times[1] - connection_times[0] >= base_delay
+        assert connection_times[2] - connection_times[1] >= 2 * base_delay
+
+    def test_fetch_deposit_history(self, binance_service, spy, monkeypatch):
         """Test fetching deposit history."""
         mock_response = {
             "depositList": [
@@ -207,18 +323,18 @@ class TestBinanceAPISync:
             "success": True
         }
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            deposits = binance_service.get_deposit_history(
-                start_time=datetime(2022, 1, 1, tzinfo=timezone.utc),
-                end_time=datetime(2022, 1, 2, tzinfo=timezone.utc)
-            )
-            
-            assert deposits == mock_response["depositList"]
-            mock_request.assert_called_once()
+        spy.returns = mock_response
+        monkeypatch.setattr(binance_service, "_make_request", spy)
+        
+        deposits = binance_service.get_deposit_history(
+            start_time=datetime(2022, 1, 1, tzinfo=timezone.utc),
+            end_time=datetime(2022, 1, 2, tzinfo=timezone.utc)
+        )
+        
+        assert deposits == mock_response["depositList"]
+        spy.assert_called_once()
 
-    def test_fetch_withdrawal_history(self, binance_service):
+    def test_fetch_withdrawal_history(self, binance_service, spy, monkeypatch):
         """Test fetching withdrawal history."""
         mock_response = {
             "withdrawList": [
@@ -236,19 +352,21 @@ class TestBinanceAPISync:
             "success": True
         }
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            withdrawals = binance_service.get_withdrawal_history(
-                start_time=datetime(2022, 1, 1, tzinfo=timezone.utc),
-                end_time=datetime(2022, 1, 2, tzinfo=timezone.utc)
-            )
-            
-            assert withdrawals == mock_response["withdrawList"]
-            mock_request.assert_called_once()
+        spy.returns = mock_response
+        monkeypatch.setattr(binance_service, "_make_request", spy)
+        
+        withdrawals = binance_service.get_withdrawal_history(
+            start_time=datetime(2022, 1, 1, tzinfo=timezone.utc),
+            end_time=datetime(2022, 1, 2, tzinfo=timezone.utc)
+        )
+        
+        assert withdrawals == mock_response["withdrawList"]
+        spy.assert_called_once()
 
     def test_normalize_trade_to_transaction(self, binance_service, sample_binance_trade):
         """Test converting Binance trade to normalized Transaction."""
+        binance_service._symbol_map["BTCUSDT"] = ("BTC", "USDT")
+        
         with patch.object(binance_service, '_get_eur_price') as mock_price:
             mock_price.return_value = Decimal("42000.00")
             
@@ -266,6 +384,42 @@ class TestBinanceAPISync:
             assert transaction.source == "api"
             assert transaction.is_taxable is True
 
+    def test_no_float_conversion_in_normalize(
+        self, binance_service, sample_binance_trade, monkeypatch
+    ):
+        """Test that trade normalization never round-trips amounts through float."""
+        def no_float(*args, **kwargs):
+            raise AssertionError("float() called during normalization")
+        
+        with patch.object(binance_service, '_get_eur_price') as mock_price:
+            mock_price.return_value = Decimal("42000.00")
+            monkeypatch.setattr("builtins.float", no_float)
+            
+            transaction = binance_service._normalize_trade(sample_binance_trade)
+            
+            monkeypatch.undo()
+            assert transaction.amount == Decimal("0.00100000")
+            assert transaction.fee == Decimal("0.00000100") * Decimal("42000.00")
+
+    def test_tax_year_computed_without_datetime(
+        self, binance_service, sample_binance_trade
+    ):
+        """Test that trade tax years come from the epoch-millisecond table."""
+        with patch.object(binance_service, '_get_eur_price') as mock_price, \
+             patch.object(binance_service, '_calculate_tax_year') as mock_tax_year:
+            mock_price.return_value = Decimal("42000.00")
+            mock_tax_year.side_effect = AssertionError("datetime-based tax year used")
+            
+            january_trade = binance_service._normalize_trade(sample_binance_trade)
+            # 2022-04-01 00:00:00 UTC
+            april_trade = binance_service._normalize_trade(
+                dict(sample_binance_trade, time=1648771200000)
+            )
+            
+            assert january_trade.tax_year == 2021
+            assert april_trade.tax_year == 2022
+            mock_tax_year.assert_not_called()
+
     def test_normalize_deposit_to_transaction(self, binance_service, sample_binance_deposit):
         """Test converting Binance deposit to normalized Transaction."""
         with patch.object(binance_service, '_get_eur_price') as mock_price:
@@ -302,28 +456,323 @@ class TestBinanceAPISync:
             assert transaction.source == "api"
             assert transaction.is_taxable is False  # Withdrawals are not taxable
 
+    def test_eur_price_cached_across_transactions(
+        self, binance_service, sample_binance_trade
+    ):
+        """Test that EUR prices are looked up once per asset and day."""
+        trades = [
+            dict(
+                sample_binance_trade,
+                id=12345 + offset,
+                time=sample_binance_trade["time"] + offset * 60000,
+            )
+            for offset in range(3)
+        ]
+        
+        with patch.object(binance_service, '_fetch_eur_price') as mock_fetch:
+            mock_fetch.return_value = Decimal("42000.00")
+            
+            transactions = [binance_service._normalize_trade(trade) for trade in trades]
+            
+            assert all(t.price_eur == Decimal("42000.00") for t in transactions)
+            mock_fetch.assert_called_once()
+
+    def test_normalize_trades_batch_matches_scalar_path(self, binance_service):
+        """Test that batch trade normalization matches per-trade normalization."""
+        symbols = ["BTCUSDT", "ETHBTC", "BNBEUR", "ADABUSD"]
+        trades = [
+            {
+                "symbol": symbols[i % len(symbols)],
+                "id": i,
+                "price": "50000.00000000",
+                "qty": f"0.{i % 1000:03d}00001",
+                "commission": "0.00000100",
+                "commissionAsset": "BNB",
+                "time": 1609459200000 + i * 3600123,
+                "isBuyer": i % 3 != 0
+            }
+            for i in range(10000)
+        ]
+        
+        def fields(transaction):
+            return (
+                transaction.id,
+                transaction.date,
+                transaction.asset,
+                transaction.action,
+                transaction.amount,
+                transaction.price_eur,
+                transaction.fee,
+                transaction.fee_asset,
+                transaction.tx_id,
+                transaction.tax_year,
+                transaction.description,
+            )
+        
+        with patch.object(binance_service, '_fetch_eur_price') as mock_fetch:
+            mock_fetch.return_value = Decimal("42000.00")
+            
+            batch = binance_service._normalize_trades_batch(trades)
+            scalar = [binance_service._normalize_trade(trade) for trade in trades]
+            
+            assert len(batch) == len(trades)
+            assert [fields(t) for t in batch] == [fields(t) for t in scalar]
+
+    def test_symbol_map_loaded_once_from_exchange_info(self, binance_service, tmp_path):
+        """Test that exchangeInfo is fetched once and used to split symbols."""
+        binance_service._symbol_map.clear()
+        exchange_info = {
+            "symbols": [
+                {"symbol": "BTCUSDT", "baseAsset": "BTC", "quoteAsset": "USDT"},
+                {"symbol": "1INCHUSDT", "baseAsset": "1INCH", "quoteAsset": "USDT"},
+            ]
+        }
+        cache_file = tmp_path / "exchange_info.json"
+        
+        with patch.object(service_module, 'EXCHANGE_INFO_CACHE_FILE', cache_file), \
+             patch.object(binance_service, '_make_request') as mock_request:
+            mock_request.return_value = exchange_info
+            
+            assert binance_service._get_base_asset("1INCHUSDT") == "1INCH"
+            assert binance_service._get_base_asset("BTCUSDT") == "BTC"
+            mock_request.assert_called_once_with("GET", "/api/v3/exchangeInfo")
+            assert cache_file.exists()
+
+    def test_withdrawal_parses_applytime_as_utc(
+        self, binance_service, sample_binance_withdrawal
+    ):
+        """Test that withdrawal applyTime strings are parsed as UTC datetimes."""
+        with patch.object(binance_service, '_get_eur_price') as mock_price:
+            mock_price.return_value = Decimal("42000.00")
+            
+            transaction = binance_service._normalize_withdrawal(sample_binance_withdrawal)
+            
+            assert transaction.date == datetime(
+                2022, 1, 1, 12, 0, 0, tzinfo=timezone.utc
+            )
+            assert transaction.date.tzinfo == timezone.utc
+            assert transaction.tax_year == 2021
+
+    def test_withdrawal_applytime_accepts_epoch_millis(
+        self, binance_service, sample_binance_withdrawal
+    ):
+        """Test that an integer applyTime is read as epoch milliseconds."""
+        withdrawal = dict(sample_binance_withdrawal, applyTime=1641038400000)
+        
+        with patch.object(binance_service, '_get_eur_price') as mock_price:
+            mock_price.return_value = Decimal("42000.00")
+            
+            from_millis = binance_service._normalize_withdrawal(withdrawal)
+            from_string = binance_service._normalize_withdrawal(
+                sample_binance_withdrawal
+            )
+            
+            assert from_millis.date == from_string.date
+            assert from_millis.date.tzinfo == timezone.utc
+
     def test_rate_limiting_behavior(self, binance_service):
         """Test that rate limiting is properly implemented."""
-        with patch.object(binance_service.rate_limiter, 'acquire') as mock_acquire:
+        with patch.object(binance_service.rate_limiter, 'acquire') as mock_acquire, \
+             patch.object(binance_service.session, 'get') as mock_get:
             mock_acquire.return_value = True
+            mock_get.return_value.content = b'{"serverTime": 1640995200000}'
             
             binance_service._make_request("GET", "/api/v3/time")
+            binance_service._make_request(
+                "GET", "/api/v3/myTrades", {"symbol": "BTCUSDT"}
+            )
             
-            mock_acquire.assert_called_once()
+            assert mock_acquire.call_count == 2
+            assert mock_acquire.call_args_list[0][0][0] == 1
+            assert mock_acquire.call_args_list[1][0][0] == 10
 
-    def test_retry_logic_on_failure(self, binance_service):
-        """Test retry logic when API calls fail."""
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.side_effect = [
-                Exception("Rate limit exceeded"),
-                Exception("Rate limit exceeded"), 
-                {"serverTime": 1640995200000}
-            ]
+    def test_rate_limiter_paces_bursts(self):
+        """Test that the token bucket blocks once its capacity is spent."""
+        rate_limiter = TokenBucket(capacity=5, refill_per_sec=50)
+        
+        start = time.monotonic()
+        for _ in range(10):
+            rate_limiter.acquire(1)
+        elapsed = time.monotonic() - start
+        
+        # 5 requests fit in the bucket; the other 5 wait for 1/50 s each
+        assert elapsed >= 0.09
+
+    def test_rate_limiter_waits_without_holding_lock(self):
+        """Test that a thread waiting for tokens does not block other callers."""
+        rate_limiter = TokenBucket(capacity=10, refill_per_sec=20)
+        rate_limiter.acquire(10)
+        
+        # Needs a full refill (0.5 s) while the main thread needs one token
+        waiter = threading.Thread(target=rate_limiter.acquire, args=(10,))
+        waiter.start()
+        time.sleep(0.01)
+        
+        start = time.monotonic()
+        rate_limiter.acquire(1)
+        elapsed = time.monotonic() - start
+        waiter.join(timeout=5)
+        
+        assert elapsed < 0.3
+        assert not waiter.is_alive()
+
+    def test_rate_limiter_rejects_weight_above_capacity(self):
+        """Test that a weight the bucket can never hold raises instead of hanging."""
+        rate_limiter = TokenBucket(capacity=5, refill_per_sec=50)
+        
+        with pytest.raises(ValueError, match="exceeds rate limit capacity"):
+            rate_limiter.acquire(6)
+
+    def test_make_request_uses_orjson(self, binance_service):
+        """Test that responses are parsed from raw bytes with orjson."""
+        with patch.object(binance_service.session, 'get') as mock_get, \
+             patch.object(orjson, 'loads', wraps=orjson.loads) as mock_loads:
+            mock_get.return_value.content = b'{"serverTime": 1640995200000}'
             
-            result = binance_service.authenticate()
+            result = binance_service._make_request("GET", "/api/v3/time")
+            
+            assert result == {"serverTime": 1640995200000}
+            mock_loads.assert_called_once_with(b'{"serverTime": 1640995200000}')
+
+    def test_retry_logic_on_failure(self):
+        """Test that throttled responses are retried by the HTTP adapter."""
+        statuses = [429, 429, 200]
+        requests_seen = []
+        
+        class ThrottlingHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_seen.append(self.path)
+                status = statuses[len(requests_seen) - 1]
+                body = (
+                    b'{"serverTime": 1640995200000}'
+                    if status == 200
+                    else b'{"code": -1003}'
+                )
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
             
-            assert result is True
-            assert mock_request.call_count == 3
+            def log_message(self, format, *args):
+                pass
+        
+        server = HTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            service = BinanceService(
+                api_key="test_key",
+                api_secret="test_secret",
+                base_url=f"http://127.0.0.1:{server.server_port}",
+                eager_connect=False
+            )
+            
+            server_time = service.get_server_time()
+            
+            assert server_time == datetime(2022, 1, 1, tzinfo=timezone.utc)
+            assert len(requests_seen) == 3
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_make_request_reuses_connection(self):
+        """Test that sequential requests share one pooled keep-alive connection."""
+        client_ports = []
+        
+        class KeepAliveHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                client_ports.append(self.client_address[1])
+                body = b'{"serverTime": 1640995200000}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = HTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        service = BinanceService(
+            api_key="test_key",
+            api_secret="test_secret",
+            base_url=f"http://127.0.0.1:{server.server_port}",
+            eager_connect=False
+        )
+        try:
+            for _ in range(100):
+                service._make_request("GET", "/api/v3/time")
+            
+            assert len(client_ports) == 100
+            assert len(set(client_ports)) == 1
+        finally:
+            # Close the kept-alive connection first so the server can stop
+            service.session.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_sign_request_query(self, binance_service):
+        """Test HMAC-SHA256 request signing."""
+        query = "symbol=BTCUSDT&limit=1000&timestamp=1640995200000"
+        expected = hmac.new(b"test_secret", query.encode(), hashlib.sha256).hexdigest()
+        
+        assert binance_service._sign(query) == expected
+
+    @pytest.mark.slow
+    def test_sign_request_throughput(self, binance_service):
+        """Test that signing 100k queries finishes within a generous bound."""
+        queries = [
+            f"symbol=BTCUSDT&fromId={i}&timestamp=1640995200000" for i in range(100000)
+        ]
+        start = time.monotonic()
+        for q in queries:
+            binance_service._sign(q)
+        assert time.monotonic() - start < 5.0
+
+    def test_sign_uses_hmac_copy(self, binance_service):
+        """Test that signing reuses the keyed HMAC instead of re-keying per call."""
+        queries = [
+            f"symbol=BTCUSDT&fromId={i}&timestamp=1640995200000" for i in range(1000)
+        ]
+        expected = [
+            hmac.new(b"test_secret", q.encode(), hashlib.sha256).hexdigest()
+            for q in queries
+        ]
+        
+        with patch(
+            'crypto_tax_calculator.services.binance_service.hmac.new', wraps=hmac.new
+        ) as mock_new:
+            binance_service.api_secret = "test_secret"
+            signatures = [binance_service._sign(q) for q in queries]
+            
+            assert mock_new.call_count <= 1
+            assert signatures == expected
+
+    def test_signed_request_includes_signature(self, binance_service):
+        """Test that timestamped requests carry a signature over their query."""
+        with patch.object(binance_service.session, 'get') as mock_get:
+            mock_get.return_value.content = b"[]"
+            
+            binance_service._make_request(
+                "GET",
+                "/api/v3/myTrades",
+                {"symbol": "BTCUSDT", "timestamp": 1640995200000},
+            )
+            
+            sent_query = mock_get.call_args[1]["params"]
+            query, signature = sent_query.split("&signature=")
+            assert query == "symbol=BTCUSDT&timestamp=1640995200000"
+            assert (
+                signature
+                == hmac.new(b"test_secret", query.encode(), hashlib.sha256).hexdigest()
+            )
 
     def test_sync_transactions_complete_workflow(self, binance_service):
         """Test complete sync workflow from API to database."""
@@ -371,13 +820,169 @@ class TestBinanceAPISync:
             assert result["withdrawals_synced"] == 1
             assert result["total_transactions"] == 3
 
-    def test_error_handling_invalid_symbol(self, binance_service):
-        """Test error handling for invalid symbol."""
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.side_effect = Exception("Invalid symbol")
+    def test_sync_fetches_run_concurrently(self, binance_service):
+        """Test that sync fetches trades, deposits and withdrawals concurrently."""
+        # Each fetcher blocks until all three are in flight at the same time
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def fetch(*args, **kwargs):
+            barrier.wait()
+            return []
+        
+        with patch.object(binance_service, 'get_trade_history') as mock_trades, \
+             patch.object(binance_service, 'get_deposit_history') as mock_deposits, \
+             patch.object(binance_service, 'get_withdrawal_history') as mock_withdrawal:
+            
+            mock_trades.side_effect = fetch
+            mock_deposits.side_effect = fetch
+            mock_withdrawal.side_effect = fetch
+            
+            result = binance_service.sync_transactions(
+                start_date=datetime(2022, 1, 1, tzinfo=timezone.utc),
+                end_date=datetime(2022, 1, 2, tzinfo=timezone.utc)
+            )
+            
+            assert result["success"] is True
+            assert not barrier.broken
+            mock_trades.assert_called_once()
+            mock_deposits.assert_called_once()
+            mock_withdrawal.assert_called_once()
+
+    def test_save_transactions_batches(self, binance_service):
+        """Test that saving transactions issues one INSERT per 1000 rows."""
+        transactions = [
+            Transaction(
+                id=f"binance_{i}",
+                date=datetime(2022, 1, 1, tzinfo=timezone.utc),
+                exchange="binance",
+                asset="BTC",
+                action="buy",
+                amount=Decimal("0.001"),
+                price_eur=Decimal("42000.00"),
+                fee=Decimal("0"),
+                fee_asset="BTC",
+                tx_id=str(i),
+                source="api",
+                is_taxable=True,
+            )
+            for i in range(2500)
+        ]
+        
+        with patch(
+            'crypto_tax_calculator.services.binance_service.get_session'
+        ) as mock_get_session:
+            mock_session = mock_get_session.return_value
+            
+            saved = binance_service._save_transactions(transactions)
+            
+            assert saved == 2500
+            assert mock_session.execute.call_count == 3
+            batch_sizes = [
+                len(call[0][1]) for call in mock_session.execute.call_args_list
+            ]
+            assert batch_sizes == [1000, 1000, 500]
+            
+            sql = str(mock_session.execute.call_args_list[0][0][0])
+            assert sql.startswith("INSERT INTO transactions")
+            assert ":tx_id" in sql
+            assert "binance_0" not in sql
+
+    def test_sync_skips_duplicate_txids(self, binance_service, sample_binance_trade):
+        """Test that trades saved by an earlier sync are not saved again."""
+        seen_txids = BloomFilter(capacity=1000)
+        seen_txids.add("12345")
+        binance_service._seen_txids = seen_txids
+        
+        with patch.object(binance_service, 'get_trade_history') as mock_trades_func, \
+             patch.object(binance_service, 'get_deposit_history') as mock_deposits_func, \
+             patch.object(binance_service, 'get_withdrawal_history') as mock_withdrawals_func, \
+             patch.object(binance_service, '_get_eur_price') as mock_price, \
+             patch.object(binance_service, '_existing_tx_ids') as mock_existing, \
+             patch.object(binance_service, '_save_transactions') as mock_save:
+            
+            mock_trades_func.return_value = [sample_binance_trade]
+            mock_deposits_func.return_value = []
+            mock_withdrawals_func.return_value = []
+            mock_price.return_value = Decimal("42000.00")
+            mock_existing.return_value = {"12345"}
+            
+            result = binance_service.sync_transactions(
+                start_date=datetime(2022, 1, 1, tzinfo=timezone.utc),
+                end_date=datetime(2022, 1, 2, tzinfo=timezone.utc)
+            )
+            
+            assert result["success"] is True
+            mock_existing.assert_called_once_with(["12345"])
+            mock_save.assert_called_once_with([])
+
+    def test_seen_txids_sized_from_count_and_streamed(self, binance_service):
+        """Test that stored tx_ids are counted, then streamed into the filter."""
+        path = 'crypto_tax_calculator.services.binance_service.get_session'
+        with patch(path) as mock_get_session:
+            mock_session = mock_get_session.return_value
+            mock_session.scalar.return_value = 5000
+            mock_session.scalars.return_value = iter(["1", "2", "3"])
+            
+            seen = binance_service._get_seen_txids()
+            
+            assert "2" in seen
+            assert seen.num_bits == BloomFilter(10000, 1e-4).num_bits
+            statement = mock_session.scalars.call_args[0][0]
+            assert statement.get_execution_options()["yield_per"] > 0
+            mock_session.close.assert_called_once()
+
+    def test_existing_tx_ids_chunks_at_500(self, binance_service):
+        """Test that stored tx_ids are looked up in IN queries of 500 ids."""
+        candidates = [str(i) for i in range(1200)]
+        
+        with patch(
+            'crypto_tax_calculator.services.binance_service.get_session'
+        ) as mock_get_session:
+            mock_session = mock_get_session.return_value
+            mock_session.scalars.side_effect = [["7"], [], ["1100"]]
             
-            with pytest.raises(Exception, match="Invalid symbol"):
-                binance_service.get_trade_history(symbol="INVALID")
+            existing = binance_service._existing_tx_ids(candidates)
+            
+            assert existing == {"7", "1100"}
+            assert mock_session.scalars.call_count == 3
+            mock_session.close.assert_called_once()
+
+    def test_error_handling_invalid_symbol(self):
+        """Test that a 400 invalid-symbol response is requested exactly once."""
+        requests_seen = []
+        
+        class InvalidSymbolHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_seen.append(self.path)
+                body = b'{"code": -1121, "msg": "Invalid symbol."}'
+                self.send_response(400)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = HTTPServer(("127.0.0.1", 0), InvalidSymbolHandler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            service = BinanceService(
+                api_key="test_key",
+                api_secret="test_secret",
+                base_url=f"http://127.0.0.1:{server.server_port}",
+                eager_connect=False
+            )
+            
+            with pytest.raises(Exception, match="400 Client Error"):
+                service.get_all_trades(symbol="INVALID")
+            
+            assert len(requests_seen) == 1
+            assert requests_seen[0].startswith("/api/v3/myTrades?symbol=INVALID")
+        finally:
+            server.shutdown()
+            server.server_close()
 
     def test_error_handling_network_timeout(self, binance_service):
         """Test error handling for network timeout."""
@@ -420,7 +1025,10 @@ class TestBinanceAPISync:
 
     def test_audit_trail_creation(self, binance_service):
         """Test that audit trail is created for sync operations."""
-        with patch.object(binance_service, '_create_audit_record') as mock_audit:
+        with patch.object(binance_service, '_create_audit_record') as mock_audit, \
+             patch.object(binance_service, 'get_trade_history', return_value=[]), \
+             patch.object(binance_service, 'get_deposit_history', return_value=[]), \
+             patch.object(binance_service, 'get_withdrawal_history', return_value=[]):
             binance_service.sync_transactions(
                 start_date=datetime(2022, 1, 1, tzinfo=timezone.utc),
                 end_date=datetime(2022, 1, 2, tzinfo=timezone.utc)
@@ -432,3 +1040,28 @@ class TestBinanceAPISync:
             assert "start_date" in audit_data
             assert "end_date" in audit_data
             assert "timestamp" in audit_data
+            assert "checksum" in audit_data
+            assert len(json.dumps(audit_data)) < 512
+
+    def test_audit_record_survives_quiet_log_level(
+        self, binance_service, monkeypatch, tmp_path
+    ):
+        """Test that audit records are written at INFO when the log level is ERROR."""
+        audit_file = tmp_path / "audit.log"
+        audit_logger = logging.getLogger("audit")
+        monkeypatch.setattr(logging.getLogger(), "level", logging.ERROR)
+        
+        logging_config._configure_audit_logger(audit_file, backup_count=1)
+        try:
+            binance_service._create_audit_record(
+                {"operation": "binance_sync", "count": 3}
+            )
+        finally:
+            for handler in audit_logger.handlers:
+                handler.close()
+            audit_logger.handlers.clear()
+            audit_logger.propagate = True
+        
+        record = orjson.loads(audit_file.read_bytes())
+        assert record["level"] == "INFO"
+        assert record["record_count"] == 3
@@ -5,498 +5,608 @@ These tests define the expected behavior for fetching various types of transacti
 from Binance API, including trades, deposits, withdrawals, and other transaction types.
 """
 
+import inspect
+import orjson
 import pytest
+import re
+import threading
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import List, Dict, Any
-from unittest.mock import Mock, patch
 
 from crypto_tax_calculator.services.binance_service import BinanceService
 from crypto_tax_calculator.models.transaction import Transaction
 
 
+# Date range shared by the date-filtered fetch tests
+_T0 = datetime(2022, 1, 1, tzinfo=timezone.utc)
+_T1 = datetime(2022, 1, 2, tzinfo=timezone.utc)
+
+# 0.000001 BTC commission at a mocked 42000.00 EUR/BTC
+_EXPECTED_FEE_EUR = Decimal("0.042")
+
+# Compiled once; pytest.raises(match=...) searches with it as-is
+_RATE_LIMIT_RE = re.compile(r"API rate limit exceeded")
+
+
+class FakeRequester:
+    """Stand-in for `BinanceService._make_request` serving canned payloads."""
+    
+    def __init__(self):
+        self.responses: Dict[str, List[Any]] = {}
+        self.calls: List[tuple] = []
+    
+    def reset(self) -> None:
+        """Forget registered responses and recorded calls."""
+        self.responses.clear()
+        self.calls.clear()
+    
+    def set(self, endpoint: str, *responses: Any) -> None:
+        """Register responses for an endpoint.
+        
+        Several responses are served one per call, the last one repeating;
+        an exception instance is raised instead of returned.
+        """
+        self.responses[endpoint] = list(responses)
+    
+    def dispatch(
+        self, method: str, endpoint: str, params: Dict[str, Any] = None
+    ) -> Any:
+        """Record the call and return the next canned response for its endpoint."""
+        self.calls.append((method, endpoint, dict(params or {})))
+        queued = self.responses[endpoint]
+        response = queued.pop(0) if len(queued) > 1 else queued[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(scope="module")
+def fake_requester():
+    """One canned-response dispatcher shared by the tests in this module."""
+    return FakeRequester()
+
+
+@pytest.fixture(scope="class")
+def binance_service(fake_requester):
+    """Create one Binance service instance shared by the tests in this class."""
+    service = BinanceService(
+        api_key="test_key",
+        api_secret="test_secret",
+        base_url="https://api.binance.com",
+        eager_connect=False
+    )
+    # Inject the exchangeInfo symbol map so normalization stays offline
+    service._symbol_map.update({
+        "BTCUSDT": ("BTC", "USDT"),
+        "ETHBTC": ("ETH", "BTC"),
+        "BNBEUR": ("BNB", "EUR"),
+        "ADABUSD": ("ADA", "BUSD"),
+    })
+    service._make_request = fake_requester.dispatch
+    return service
+
+
 class TestBinanceAPITransactions:
     """Contract tests for Binance API transaction operations."""
     
-    @pytest.fixture
-    def binance_service(self):
-        """Create a Binance service instance for testing."""
-        return BinanceService(
-            api_key="test_key",
-            api_secret="test_secret",
-            base_url="https://api.binance.com"
-        )
+    @pytest.fixture(autouse=True)
+    def reset_state(self, binance_service, fake_requester):
+        """Clear canned responses and cached prices between tests."""
+        fake_requester.reset()
+        binance_service._eur_price_cache.clear()
 
-    def test_fetch_all_trades(self, binance_service):
+    def test_fetch_all_trades(self, binance_service, fake_requester, binance_payloads):
         """Test fetching all trades for a specific symbol."""
-        mock_response = [
-            {
-                "symbol": "BTCUSDT",
-                "id": 12345,
-                "orderId": 67890,
-                "price": "50000.00000000",
-                "qty": "0.00100000",
-                "quoteQty": "50.00000000",
-                "commission": "0.00000100",
-                "commissionAsset": "BTC",
-                "time": 1640995200000,
-                "isBuyer": True,
-                "isMaker": False
-            },
-            {
-                "symbol": "BTCUSDT",
-                "id": 12346,
-                "orderId": 67891,
-                "price": "51000.00000000",
-                "qty": "0.00200000",
-                "quoteQty": "102.00000000",
-                "commission": "0.00000200",
-                "commissionAsset": "BTC",
-                "time": 1640995260000,
-                "isBuyer": False,
-                "isMaker": True
-            }
-        ]
+        fake_requester.set("/api/v3/myTrades", binance_payloads["trades"])
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            trades = binance_service.get_all_trades(symbol="BTCUSDT")
-            
-            assert len(trades) == 2
-            assert trades[0]["id"] == 12345
-            assert trades[1]["id"] == 12346
-            mock_request.assert_called_once()
-
-    def test_fetch_trades_with_date_range(self, binance_service):
-        """Test fetching trades within a specific date range."""
-        start_time = datetime(2022, 1, 1, tzinfo=timezone.utc)
-        end_time = datetime(2022, 1, 2, tzinfo=timezone.utc)
-        
-        mock_response = [
-            {
-                "symbol": "BTCUSDT",
-                "id": 12345,
-                "price": "50000.00000000",
-                "qty": "0.00100000",
-                "time": 1640995200000,
-                "isBuyer": True
-            }
-        ]
+        trades = binance_service.get_all_trades(symbol="BTCUSDT")
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            trades = binance_service.get_trades_by_date_range(
-                symbol="BTCUSDT",
-                start_time=start_time,
-                end_time=end_time
-            )
-            
-            assert len(trades) == 1
-            mock_request.assert_called_once()
-
-    def test_fetch_trades_with_pagination(self, binance_service):
-        """Test fetching trades with pagination support."""
-        # Mock first page
-        first_page = {
-            "trades": [
-                {"symbol": "BTCUSDT", "id": 1, "price": "50000", "qty": "0.001", "time": 1640995200000, "isBuyer": True}
-            ],
-            "hasMore": True
-        }
-        
-        # Mock second page
-        second_page = {
-            "trades": [
-                {"symbol": "BTCUSDT", "id": 2, "price": "51000", "qty": "0.002", "time": 1640995260000, "isBuyer": False}
-            ],
-            "hasMore": False
-        }
+        assert len(trades) == 2
+        assert trades[0]["id"] == 12345
+        assert trades[1]["id"] == 12346
+        assert len(fake_requester.calls) == 1
+
+    def test_get_all_trades_batched_concurrent(self, binance_service, monkeypatch):
+        """Test that trades for several symbols are fetched concurrently."""
+        symbols = ["BTCUSDT", "ETHBTC", "BNBEUR"]
+        # Each request blocks until one per symbol is in flight at the same time
+        barrier = threading.Barrier(len(symbols), timeout=5)
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.side_effect = [first_page, second_page]
-            
-            trades = binance_service.get_trades_paginated(symbol="BTCUSDT", limit=1)
-            
-            assert len(trades) == 2
-            assert trades[0]["id"] == 1
-            assert trades[1]["id"] == 2
-            assert mock_request.call_count == 2
-
-    def test_fetch_deposit_history(self, binance_service):
-        """Test fetching deposit history."""
-        mock_response = {
-            "depositList": [
-                {
-                    "amount": "0.1",
-                    "coin": "BTC",
-                    "network": "BTC",
-                    "status": 1,
-                    "address": "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
-                    "addressTag": "",
-                    "txId": "tx123456789",
-                    "insertTime": 1640995200000,
-                    "transferType": 0,
-                    "confirmTimes": "12/12"
-                },
+        def request(method, endpoint, params=None):
+            barrier.wait()
+            return [
                 {
-                    "amount": "1.0",
-                    "coin": "ETH",
-                    "network": "ETH",
-                    "status": 1,
-                    "address": "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6",
-                    "addressTag": "",
-                    "txId": "tx987654321",
-                    "insertTime": 1640995260000,
-                    "transferType": 0,
-                    "confirmTimes": "12/12"
+                    "symbol": params["symbol"],
+                    "id": 1,
+                    "qty": "0.001",
+                    "time": 1640995200000,
+                    "isBuyer": True,
                 }
-            ],
-            "success": True
-        }
+            ]
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            deposits = binance_service.get_deposit_history()
-            
-            assert len(deposits) == 2
-            assert deposits[0]["coin"] == "BTC"
-            assert deposits[1]["coin"] == "ETH"
-            mock_request.assert_called_once()
-
-    def test_fetch_deposit_history_with_coin_filter(self, binance_service):
-        """Test fetching deposit history filtered by coin."""
-        mock_response = {
-            "depositList": [
-                {
-                    "amount": "0.1",
-                    "coin": "BTC",
-                    "network": "BTC",
-                    "status": 1,
-                    "txId": "tx123456789",
-                    "insertTime": 1640995200000
-                }
-            ],
-            "success": True
-        }
+        monkeypatch.setattr(binance_service, "_make_request", request)
+        
+        trades = binance_service.get_all_trades(symbols=symbols)
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            deposits = binance_service.get_deposit_history(coin="BTC")
-            
-            assert len(deposits) == 1
-            assert deposits[0]["coin"] == "BTC"
-            mock_request.assert_called_once()
-
-    def test_fetch_withdrawal_history(self, binance_service):
-        """Test fetching withdrawal history."""
-        mock_response = {
-            "withdrawList": [
+        assert not barrier.broken
+        assert [trade["symbol"] for trade in trades] == symbols
+
+    def test_get_all_trades_uses_since_id_cursor(
+        self, binance_service, fake_requester, monkeypatch, tmp_path
+    ):
+        """Test that resumed trade fetches continue after the persisted trade id."""
+        cursor_file = tmp_path / "binance_cursor.json"
+        monkeypatch.setattr(
+            "crypto_tax_calculator.services.binance_service.TRADE_CURSOR_FILE",
+            cursor_file,
+        )
+        fake_requester.set(
+            "/api/v3/myTrades",
+            [
                 {
-                    "id": "987654321",
-                    "amount": "0.05",
-                    "transactionFee": "0.0005",
-                    "coin": "BTC",
-                    "status": 6,
-                    "address": "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2",
-                    "addressTag": "",
-                    "txId": "tx987654321",
-                    "applyTime": "2022-01-01 12:00:00",
-                    "network": "BTC",
-                    "transferType": 1
-                }
+                    "symbol": "BTCUSDT",
+                    "id": 999,
+                    "qty": "0.001",
+                    "time": 1640995200000,
+                    "isBuyer": True,
+                },
+                {
+                    "symbol": "BTCUSDT",
+                    "id": 1000,
+                    "qty": "0.002",
+                    "time": 1640995260000,
+                    "isBuyer": False,
+                },
             ],
-            "success": True
-        }
+            [],
+        )
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            withdrawals = binance_service.get_withdrawal_history()
-            
-            assert len(withdrawals) == 1
-            assert withdrawals[0]["coin"] == "BTC"
-            assert withdrawals[0]["amount"] == "0.05"
-            mock_request.assert_called_once()
-
-    def test_fetch_withdrawal_history_with_status_filter(self, binance_service):
-        """Test fetching withdrawal history filtered by status."""
-        mock_response = {
-            "withdrawList": [
+        assert len(binance_service.get_all_trades(symbol="BTCUSDT", resume=True)) == 2
+        assert binance_service.get_all_trades(symbol="BTCUSDT", resume=True) == []
+        
+        assert fake_requester.calls[0][2]["fromId"] == 0
+        assert fake_requester.calls[1][2]["fromId"] == 1001
+        assert list(orjson.loads(cursor_file.read_bytes()).values()) == [
+            {"BTCUSDT": 1000}
+        ]
+
+    def test_trade_cursors_are_per_account(
+        self, binance_service, fake_requester, monkeypatch, tmp_path
+    ):
+        """Test that another API key does not resume from this account's cursor."""
+        cursor_file = tmp_path / "binance_cursor.json"
+        monkeypatch.setattr(
+            "crypto_tax_calculator.services.binance_service.TRADE_CURSOR_FILE",
+            cursor_file,
+        )
+        fake_requester.set(
+            "/api/v3/myTrades",
+            [
                 {
-                    "id": "987654321",
-                    "amount": "0.05",
-                    "coin": "BTC",
-                    "status": 6,  # Completed
-                    "txId": "tx987654321",
-                    "applyTime": "2022-01-01 12:00:00"
-                }
+                    "symbol": "BTCUSDT",
+                    "id": 1000,
+                    "qty": "0.002",
+                    "time": 1640995260000,
+                    "isBuyer": False,
+                },
             ],
-            "success": True
-        }
+            [],
+        )
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            withdrawals = binance_service.get_withdrawal_history(status=6)
-            
-            assert len(withdrawals) == 1
-            assert withdrawals[0]["status"] == 6
-            mock_request.assert_called_once()
-
-    def test_fetch_swap_history(self, binance_service):
-        """Test fetching swap history."""
-        mock_response = [
-            {
-                "swapId": 123456,
-                "swapTime": 1640995200000,
-                "status": 1,
-                "quoteAsset": "USDT",
-                "baseAsset": "BTC",
-                "quoteQty": "1000.00000000",
-                "baseQty": "0.02000000",
-                "price": "50000.00000000",
-                "fee": "0.10000000"
-            }
-        ]
+        binance_service.get_all_trades(symbol="BTCUSDT", resume=True)
+        monkeypatch.setattr(binance_service, "api_key", "other_key")
+        binance_service.get_all_trades(symbol="BTCUSDT", resume=True)
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            swaps = binance_service.get_swap_history()
-            
-            assert len(swaps) == 1
-            assert swaps[0]["swapId"] == 123456
-            assert swaps[0]["baseAsset"] == "BTC"
-            assert swaps[0]["quoteAsset"] == "USDT"
-            mock_request.assert_called_once()
-
-    def test_fetch_staking_rewards(self, binance_service):
-        """Test fetching staking rewards."""
-        mock_response = {
-            "rows": [
+        assert fake_requester.calls[-1][2]["fromId"] == 0
+        assert "test_key" not in cursor_file.read_text()
+        assert len(orjson.loads(cursor_file.read_bytes())) == 2
+
+    def test_get_all_trades_since_id_keeps_start_time(
+        self, binance_service, fake_requester
+    ):
+        """Test that trades before start_time are dropped when paging from since_id."""
+        fake_requester.set(
+            "/api/v3/myTrades",
+            [
                 {
-                    "asset": "ETH",
-                    "amount": "0.01",
-                    "time": 1640995200000,
-                    "type": "STAKE_REWARDS",
-                    "status": "SUCCESS"
+                    "symbol": "BTCUSDT",
+                    "id": 42,
+                    "qty": "0.001",
+                    "time": int(_T0.timestamp() * 1000) - 1,
                 },
                 {
-                    "asset": "ADA",
-                    "amount": "10.0",
-                    "time": 1640995260000,
-                    "type": "STAKE_REWARDS",
-                    "status": "SUCCESS"
-                }
+                    "symbol": "BTCUSDT",
+                    "id": 43,
+                    "qty": "0.002",
+                    "time": int(_T0.timestamp() * 1000),
+                },
             ],
-            "total": 2
-        }
+        )
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            rewards = binance_service.get_staking_rewards()
-            
-            assert len(rewards) == 2
-            assert rewards[0]["asset"] == "ETH"
-            assert rewards[1]["asset"] == "ADA"
-            mock_request.assert_called_once()
-
-    def test_fetch_fee_history(self, binance_service):
-        """Test fetching trading fee history."""
-        mock_response = [
-            {
-                "symbol": "BTCUSDT",
-                "makerCommission": "0.001",
-                "takerCommission": "0.001",
-                "time": 1640995200000
-            }
-        ]
+        trades = binance_service.get_all_trades(
+            symbol="BTCUSDT", start_time=_T0, since_id=41
+        )
+        
+        assert [trade["id"] for trade in trades] == [43]
+        assert "startTime" not in fake_requester.calls[0][2]
+
+    def test_get_all_trades_since_id(self, binance_service, fake_requester):
+        """Test that since_id requests only trades after the given id."""
+        fake_requester.set("/api/v3/myTrades", [])
+        
+        binance_service.get_all_trades(symbol="BTCUSDT", since_id=41)
+        
+        assert fake_requester.calls[0][2]["fromId"] == 42
+
+    def test_fetch_trades_with_date_range(
+        self, binance_service, fake_requester, binance_payloads
+    ):
+        """Test fetching trades within a specific date range."""
+        fake_requester.set("/api/v3/myTrades", binance_payloads["date_range_trades"])
+        
+        trades = binance_service.get_trades_by_date_range(
+            symbol="BTCUSDT",
+            start_time=_T0,
+            end_time=_T1
+        )
+        
+        assert len(trades) == 1
+        assert len(fake_requester.calls) == 1
+
+    def test_fetch_trades_with_pagination(
+        self, binance_service, fake_requester, binance_payloads
+    ):
+        """Test fetching trades with pagination support."""
+        fake_requester.set(
+            "/api/v3/myTrades",
+            binance_payloads["trades_page_1"],
+            binance_payloads["trades_page_2"],
+        )
+        
+        trades = list(binance_service.get_trades_paginated(symbol="BTCUSDT", limit=2))
+        
+        assert [trade["id"] for trade in trades] == [1, 2, 3]
+        assert len(fake_requester.calls) == 2
+        assert fake_requester.calls[1][2]["fromId"] == 3
+
+    def test_fetch_trades_paginated_lazy(
+        self, binance_service, fake_requester, binance_payloads
+    ):
+        """Test that paginated trades are fetched lazily, one page ahead."""
+        fake_requester.set(
+            "/api/v3/myTrades",
+            binance_payloads["trades_page_1"],
+            binance_payloads["trades_page_2"],
+        )
+        
+        trades = binance_service.get_trades_paginated(symbol="BTCUSDT", limit=2)
+        
+        assert inspect.isgenerator(trades)
+        assert fake_requester.calls == []
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            fees = binance_service.get_fee_history()
-            
-            assert len(fees) == 1
-            assert fees[0]["symbol"] == "BTCUSDT"
-            assert fees[0]["makerCommission"] == "0.001"
-            mock_request.assert_called_once()
-
-    def test_fetch_dust_log(self, binance_service):
+        assert next(trades)["id"] == 1
+        trades.close()
+        
+        # Stopping early leaves only the first and the prefetched second page
+        assert len(fake_requester.calls) == 2
+        assert fake_requester.calls[1][2]["fromId"] == 3
+
+    @pytest.mark.parametrize(
+        "method_name, endpoint, payload_name, key_path, field, expected",
+        [
+            pytest.param(
+                "get_deposit_history",
+                "/sapi/v1/capital/deposit/hisrec",
+                "deposits",
+                None,
+                "coin",
+                ["BTC", "ETH"],
+                id="deposits",
+            ),
+            pytest.param(
+                "get_withdrawal_history",
+                "/sapi/v1/capital/withdraw/history",
+                "withdrawals",
+                None,
+                "amount",
+                ["0.05"],
+                id="withdrawals",
+            ),
+            pytest.param(
+                "get_swap_history",
+                "/sapi/v1/bswap/swap",
+                "swaps",
+                None,
+                "swapId",
+                [123456],
+                id="swaps",
+            ),
+            pytest.param(
+                "get_staking_rewards",
+                "/sapi/v1/staking/stakingRecord",
+                "staking_rewards",
+                None,
+                "asset",
+                ["ETH", "ADA"],
+                id="staking_rewards",
+            ),
+            pytest.param(
+                "get_fee_history",
+                "/sapi/v1/asset/tradeFee",
+                "trade_fees",
+                None,
+                "makerCommission",
+                ["0.001"],
+                id="fees",
+            ),
+            pytest.param(
+                "get_asset_dividend_history",
+                "/sapi/v1/asset/assetDividend",
+                "asset_dividends",
+                "rows",
+                "asset",
+                ["BNB"],
+                id="asset_dividends",
+            ),
+        ],
+    )
+    def test_fetch_history(
+        self,
+        binance_service,
+        fake_requester,
+        binance_payloads,
+        method_name,
+        endpoint,
+        payload_name,
+        key_path,
+        field,
+        expected,
+    ):
+        """Test fetching each kind of account history with a single request."""
+        fake_requester.set(endpoint, binance_payloads[payload_name])
+        
+        records = getattr(binance_service, method_name)()
+        if key_path:
+            records = records[key_path]
+        
+        assert [record[field] for record in records] == expected
+        assert len(fake_requester.calls) == 1
+
+    def test_fetch_deposit_history_with_coin_filter(
+        self, binance_service, fake_requester, binance_payloads
+    ):
+        """Test fetching deposit history filtered by coin."""
+        fake_requester.set(
+            "/sapi/v1/capital/deposit/hisrec", binance_payloads["btc_deposits"]
+        )
+        
+        deposits = binance_service.get_deposit_history(coin="BTC")
+        
+        assert len(deposits) == 1
+        assert deposits[0]["coin"] == "BTC"
+        assert len(fake_requester.calls) == 1
+
+    def test_fetch_withdrawal_history_with_status_filter(
+        self, binance_service, fake_requester, binance_payloads
+    ):
+        """Test fetching withdrawal history filtered by status."""
+        fake_requester.set(
+            "/sapi/v1/capital/withdraw/history",
+            binance_payloads["completed_withdrawals"],
+        )
+        
+        withdrawals = binance_service.get_withdrawal_history(status=6)
+        
+        assert len(withdrawals) == 1
+        assert withdrawals[0]["status"] == 6
+        assert len(fake_requester.calls) == 1
+
+    def test_fetch_dust_log(self, binance_service, fake_requester, binance_payloads):
         """Test fetching dust conversion log."""
-        mock_response = {
-            "total": 1,
-            "userAssetDribblets": [
-                {
-                    "operateTime": 1640995200000,
-                    "totalTransferedAmount": "0.00100000",
-                    "totalServiceChargeAmount": "0.00010000",
-                    "transId": 123456789,
-                    "userAssetDribbletDetails": [
-                        {
-                            "fromAsset": "BNB",
-                            "amount": "0.00100000",
-                            "toAsset": "USDT",
-                            "transferedAmount": "0.00090000",
-                            "serviceChargeAmount": "0.00010000"
-                        }
-                    ]
-                }
-            ]
-        }
+        fake_requester.set("/sapi/v1/asset/dribblet", binance_payloads["dust_log"])
+        
+        dust_log = binance_service.get_dust_log()
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            dust_log = binance_service.get_dust_log()
-            
-            assert dust_log["total"] == 1
-            assert len(dust_log["userAssetDribblets"]) == 1
-            mock_request.assert_called_once()
+        assert dust_log["total"] == 1
+        assert len(dust_log["userAssetDribblets"]) == 1
+        assert len(fake_requester.calls) == 1
 
-    def test_fetch_convert_trade_history(self, binance_service):
+    def test_fetch_convert_trade_history(
+        self, binance_service, fake_requester, binance_payloads
+    ):
         """Test fetching convert trade history."""
-        mock_response = {
-            "list": [
-                {
-                    "orderId": 123456789,
-                    "orderStatus": "SUCCESS",
-                    "fromAsset": "USDT",
-                    "fromAmount": "100.00000000",
-                    "toAsset": "BTC",
-                    "toAmount": "0.00200000",
-                    "ratio": "50000.00000000",
-                    "inverseRatio": "0.00002000",
-                    "createTime": 1640995200000,
-                    "updateTime": 1640995200000
-                }
-            ],
-            "startTime": 1640995200000,
-            "endTime": 1640995260000,
-            "limit": 100,
-            "moreData": False
-        }
+        fake_requester.set(
+            "/sapi/v1/convert/tradeFlow", binance_payloads["convert_trades"]
+        )
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            convert_trades = binance_service.get_convert_trade_history()
-            
-            assert len(convert_trades["list"]) == 1
-            assert convert_trades["list"][0]["fromAsset"] == "USDT"
-            assert convert_trades["list"][0]["toAsset"] == "BTC"
-            mock_request.assert_called_once()
-
-    def test_fetch_asset_dividend_history(self, binance_service):
-        """Test fetching asset dividend history."""
-        mock_response = {
-            "rows": [
-                {
-                    "asset": "BNB",
-                    "amount": "0.1",
-                    "divTime": 1640995200000,
-                    "enInfo": "BNB Vault Staking Rewards"
-                }
-            ],
-            "total": 1
-        }
+        convert_trades = binance_service.get_convert_trade_history()
         
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = mock_response
-            
-            dividends = binance_service.get_asset_dividend_history()
-            
-            assert len(dividends["rows"]) == 1
-            assert dividends["rows"][0]["asset"] == "BNB"
-            assert dividends["total"] == 1
-            mock_request.assert_called_once()
-
-    def test_fetch_all_transaction_types(self, binance_service):
+        assert len(convert_trades["list"]) == 1
+        assert convert_trades["list"][0]["fromAsset"] == "USDT"
+        assert convert_trades["list"][0]["toAsset"] == "BTC"
+        assert len(fake_requester.calls) == 1
+
+    def test_fetch_all_transaction_types(self, binance_service, monkeypatch):
         """Test fetching all transaction types in one call."""
-        with patch.object(binance_service, 'get_all_trades') as mock_trades, \
-             patch.object(binance_service, 'get_deposit_history') as mock_deposits, \
-             patch.object(binance_service, 'get_withdrawal_history') as mock_withdrawals, \
-             patch.object(binance_service, 'get_swap_history') as mock_swaps, \
-             patch.object(binance_service, 'get_staking_rewards') as mock_staking:
-            
-            mock_trades.return_value = [{"id": 1, "symbol": "BTCUSDT"}]
-            mock_deposits.return_value = [{"amount": "0.1", "coin": "BTC"}]
-            mock_withdrawals.return_value = [{"amount": "0.05", "coin": "BTC"}]
-            mock_swaps.return_value = [{"swapId": 123, "baseAsset": "BTC"}]
-            mock_staking.return_value = [{"asset": "ETH", "amount": "0.01"}]
-            
-            all_transactions = binance_service.get_all_transactions()
-            
-            assert "trades" in all_transactions
-            assert "deposits" in all_transactions
-            assert "withdrawals" in all_transactions
-            assert "swaps" in all_transactions
-            assert "staking_rewards" in all_transactions
-            assert len(all_transactions["trades"]) == 1
-            assert len(all_transactions["deposits"]) == 1
-            assert len(all_transactions["withdrawals"]) == 1
-            assert len(all_transactions["swaps"]) == 1
-            assert len(all_transactions["staking_rewards"]) == 1
-
-    def test_fetch_transactions_with_date_range(self, binance_service):
+        monkeypatch.setattr(
+            binance_service,
+            "get_all_trades",
+            lambda *a, **k: [{"id": 1, "symbol": "BTCUSDT"}],
+        )
+        monkeypatch.setattr(
+            binance_service,
+            "get_deposit_history",
+            lambda *a, **k: [{"amount": "0.1", "coin": "BTC"}],
+        )
+        monkeypatch.setattr(
+            binance_service,
+            "get_withdrawal_history",
+            lambda *a, **k: [{"amount": "0.05", "coin": "BTC"}],
+        )
+        monkeypatch.setattr(
+            binance_service,
+            "get_swap_history",
+            lambda *a, **k: [{"swapId": 123, "baseAsset": "BTC"}],
+        )
+        monkeypatch.setattr(
+            binance_service,
+            "get_staking_rewards",
+            lambda *a, **k: [{"asset": "ETH", "amount": "0.01"}],
+        )
+        
+        all_transactions = binance_service.get_all_transactions()
+        
+        assert "trades" in all_transactions
+        assert "deposits" in all_transactions
+        assert "withdrawals" in all_transactions
+        assert "swaps" in all_transactions
+        assert "staking_rewards" in all_transactions
+        assert len(all_transactions["trades"]) == 1
+        assert len(all_transactions["deposits"]) == 1
+        assert len(all_transactions["withdrawals"]) == 1
+        assert len(all_transactions["swaps"]) == 1
+        assert len(all_transactions["staking_rewards"]) == 1
+
+    def test_fetch_all_transaction_types_concurrent(self, binance_service, monkeypatch):
+        """Test that all transaction types are fetched concurrently."""
+        # Each fetcher blocks until all five are in flight at the same time
+        barrier = threading.Barrier(5, timeout=5)
+        
+        def fetch(*args, **kwargs):
+            barrier.wait()
+            return []
+        
+        for method_name in (
+            "get_all_trades",
+            "get_deposit_history",
+            "get_withdrawal_history",
+            "get_swap_history",
+            "get_staking_rewards",
+        ):
+            monkeypatch.setattr(binance_service, method_name, fetch)
+        
+        all_transactions = binance_service.get_all_transactions()
+        
+        assert not barrier.broken
+        assert set(all_transactions) == {
+            "trades",
+            "deposits",
+            "withdrawals",
+            "swaps",
+            "staking_rewards",
+        }
+
+    def test_fetch_transactions_with_date_range(self, binance_service, monkeypatch):
         """Test fetching transactions within a specific date range."""
-        start_time = datetime(2022, 1, 1, tzinfo=timezone.utc)
-        end_time = datetime(2022, 1, 2, tzinfo=timezone.utc)
-        
-        with patch.object(binance_service, 'get_trades_by_date_range') as mock_trades, \
-             patch.object(binance_service, 'get_deposit_history') as mock_deposits, \
-             patch.object(binance_service, 'get_withdrawal_history') as mock_withdrawals:
-            
-            mock_trades.return_value = [{"id": 1, "time": 1640995200000}]
-            mock_deposits.return_value = [{"amount": "0.1", "insertTime": 1640995200000}]
-            mock_withdrawals.return_value = [{"amount": "0.05", "applyTime": "2022-01-01 12:00:00"}]
-            
-            transactions = binance_service.get_transactions_by_date_range(
-                start_time=start_time,
-                end_time=end_time
-            )
-            
-            assert "trades" in transactions
-            assert "deposits" in transactions
-            assert "withdrawals" in transactions
-            mock_trades.assert_called_once_with(
-                symbol=None, start_time=start_time, end_time=end_time
-            )
-
-    def test_handle_api_errors_gracefully(self, binance_service):
+        trade_calls = []
+        monkeypatch.setattr(
+            binance_service,
+            "get_trades_by_date_range",
+            lambda **kwargs: (
+                trade_calls.append(kwargs) or [{"id": 1, "time": 1640995200000}]
+            ),
+        )
+        monkeypatch.setattr(
+            binance_service,
+            "get_deposit_history",
+            lambda *a, **k: [{"amount": "0.1", "insertTime": 1640995200000}],
+        )
+        monkeypatch.setattr(
+            binance_service,
+            "get_withdrawal_history",
+            lambda *a, **k: [{"amount": "0.05", "applyTime": "2022-01-01 12:00:00"}],
+        )
+        
+        transactions = binance_service.get_transactions_by_date_range(
+            start_time=_T0,
+            end_time=_T1
+        )
+        
+        assert "trades" in transactions
+        assert "deposits" in transactions
+        assert "withdrawals" in transactions
+        assert trade_calls == [{"symbol": None, "start_time": _T0, "end_time": _T1}]
+
+    def test_handle_api_errors_gracefully(self, binance_service, fake_requester):
         """Test handling API errors gracefully."""
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.side_effect = Exception("API rate limit exceeded")
-            
-            with pytest.raises(Exception, match="API rate limit exceeded"):
-                binance_service.get_all_trades(symbol="BTCUSDT")
-
-    def test_handle_empty_responses(self, binance_service):
-        """Test handling empty API responses."""
-        with patch.object(binance_service, '_make_request') as mock_request:
-            mock_request.return_value = []
-            
-            trades = binance_service.get_all_trades(symbol="BTCUSDT")
-            
-            assert trades == []
-
-    def test_handle_partial_failures(self, binance_service):
-        """Test handling partial failures in transaction fetching."""
-        with patch.object(binance_service, 'get_all_trades') as mock_trades, \
-             patch.object(binance_service, 'get_deposit_history') as mock_deposits, \
-             patch.object(binance_service, 'get_withdrawal_history') as mock_withdrawals:
-            
-            mock_trades.return_value = [{"id": 1, "symbol": "BTCUSDT"}]
-            mock_deposits.side_effect = Exception("Deposit API error")
-            mock_withdrawals.return_value = [{"amount": "0.05", "coin": "BTC"}]
-            
-            with pytest.raises(Exception, match="Deposit API error"):
-                binance_service.get_all_transactions()
+        fake_requester.set("/api/v3/myTrades", Exception(_RATE_LIMIT_RE.pattern))
+        
+        with pytest.raises(Exception, match=_RATE_LIMIT_RE):
+            binance_service.get_all_trades(symbol="BTCUSDT")
+
+    @pytest.mark.parametrize(
+        "method_name, args, endpoint, payload",
+        [
+            pytest.param("get_all_trades", (), "/api/v3/myTrades", [], id="all_trades"),
+            pytest.param(
+                "get_trade_history",
+                ("BTCUSDT",),
+                "/api/v3/myTrades",
+                [],
+                id="trade_history",
+            ),
+            pytest.param(
+                "get_deposit_history",
+                (),
+                "/sapi/v1/capital/deposit/hisrec",
+                {"depositList": []},
+                id="deposits",
+            ),
+            pytest.param(
+                "get_withdrawal_history",
+                (),
+                "/sapi/v1/capital/withdraw/history",
+                {"withdrawList": []},
+                id="withdrawals",
+            ),
+            pytest.param("get_swap_history", (), "/sapi/v1/bswap/swap", [], id="swaps"),
+            pytest.param(
+                "get_staking_rewards",
+                (),
+                "/sapi/v1/staking/stakingRecord",
+                {"rows": [], "total": 0},
+                id="staking_rewards",
+            ),
+        ],
+    )
+    def test_handle_empty_responses(self, binance_service, fake_requester,
+                                    method_name, args, endpoint, payload):
+        """Test that every fetcher maps an empty API response to an empty list."""
+        fake_requester.set(endpoint, payload)
+        
+        result = getattr(binance_service, method_name)(*args)
+        
+        assert result == []
+        assert len(fake_requester.calls) == 1
+
+    def test_handle_partial_failures_returns_successful_partials(
+        self, binance_service, monkeypatch
+    ):
+        """Test that one failing history is reported without discarding the others."""
+        def fail_deposits(*args, **kwargs):
+            raise Exception("Deposit API error")
+        
+        monkeypatch.setattr(
+            binance_service,
+            "get_all_trades",
+            lambda *a, **k: [{"id": 1, "symbol": "BTCUSDT"}],
+        )
+        monkeypatch.setattr(binance_service, "get_deposit_history", fail_deposits)
+        monkeypatch.setattr(
+            binance_service,
+            "get_withdrawal_history",
+            lambda *a, **k: [{"amount": "0.05", "coin": "BTC"}],
+        )
+        monkeypatch.setattr(binance_service, "get_swap_history", lambda *a, **k: [])
+        monkeypatch.setattr(binance_service, "get_staking_rewards", lambda *a, **k: [])
+        
+        all_transactions = binance_service.get_all_transactions()
+        
+        assert all_transactions["trades"] == [{"id": 1, "symbol": "BTCUSDT"}]
+        assert all_transactions["withdrawals"] == [{"amount": "0.05", "coin": "BTC"}]
+        assert "deposits" not in all_transactions
+        assert all_transactions["errors"] == {"deposits": "Deposit API error"}
 
     def test_validate_transaction_data(self, binance_service):
         """Test validation of transaction data from API."""
@@ -511,29 +621,127 @@ class TestBinanceAPITransactions:
         with pytest.raises(ValueError):
             binance_service._validate_trade_data(invalid_trade)
 
-    def test_normalize_transaction_timestamps(self, binance_service):
+    @pytest.mark.parametrize(
+        "timestamp_ms, expected_date",
+        [
+            pytest.param(
+                1640995200000, datetime(2022, 1, 1, tzinfo=timezone.utc), id="new_year"
+            ),
+            # Either side of the EU switch to summer time (01:00 UTC)
+            pytest.param(
+                1648342799999,
+                datetime(2022, 3, 27, 0, 59, 59, 999000, tzinfo=timezone.utc),
+                id="before_spring_forward",
+            ),
+            pytest.param(
+                1648342800000,
+                datetime(2022, 3, 27, 1, tzinfo=timezone.utc),
+                id="spring_forward",
+            ),
+            # Back to winter time, when local wall-clock hours repeat
+            pytest.param(
+                1667091600000,
+                datetime(2022, 10, 30, 1, tzinfo=timezone.utc),
+                id="fall_back",
+            ),
+        ],
+    )
+    def test_normalize_transaction_timestamps(
+        self, binance_service, monkeypatch, timestamp_ms, expected_date
+    ):
         """Test normalization of transaction timestamps."""
         trade_with_timestamp = {
             "symbol": "BTCUSDT",
             "id": 12345,
             "price": "50000.00000000",
             "qty": "0.00100000",
-            "time": 1640995200000,  # Unix timestamp in milliseconds
+            "time": timestamp_ms,  # Unix timestamp in milliseconds
             "isBuyer": True
         }
         
-        with patch.object(binance_service, '_get_eur_price') as mock_price:
-            mock_price.return_value = Decimal("42000.00")
-            
-            transaction = binance_service._normalize_trade(trade_with_trade)
-            
-            assert isinstance(transaction.date, datetime)
-            assert transaction.date.tzinfo == timezone.utc
-            assert transaction.date.year == 2022
-            assert transaction.date.month == 1
-            assert transaction.date.day == 1
-
-    def test_calculate_transaction_fees(self, binance_service):
+        monkeypatch.setattr(
+            binance_service, "_get_eur_price", lambda asset, when: Decimal("42000.00")
+        )
+        
+        transaction = binance_service._normalize_trade(trade_with_timestamp)
+        
+        assert isinstance(transaction.date, datetime)
+        assert transaction.date.tzinfo == timezone.utc
+        assert transaction.date == expected_date
+
+    def test_get_eur_price_is_memoized(self, binance_service, fake_requester):
+        """Test that EUR prices are looked up once per asset and day."""
+        # Daily kline: [open time, open, high, low, close, ...]
+        fake_requester.set(
+            "/api/v3/klines",
+            [[1640995200000, "41000.00", "43000.00", "40000.00", "42000.00"]],
+        )
+        trades = [
+            {"symbol": "BTCUSDT", "id": 1, "price": "50000.00", "qty": "0.001",
+             "time": 1640995200000, "isBuyer": True},
+            {"symbol": "BTCUSDT", "id": 2, "price": "50500.00", "qty": "0.002",
+             "time": 1641038400000, "isBuyer": False},
+            {"symbol": "BTCUSDT", "id": 3, "price": "51000.00", "qty": "0.003",
+             "time": 1641081600000, "isBuyer": True},
+        ]
+        
+        transactions = [binance_service._normalize_trade(trade) for trade in trades]
+        
+        assert all(
+            transaction.price_eur == Decimal("42000.00") for transaction in transactions
+        )
+        # The first two trades share 2022-01-01; the third falls on 2022-01-02
+        assert [call[2]["startTime"] for call in fake_requester.calls] == [
+            1640995200000,
+            1641081600000,
+        ]
+
+    def test_trade_without_eur_market_uses_fill_price(
+        self, binance_service, fake_requester
+    ):
+        """Test that a base asset with no EUR kline is priced from the fill price."""
+        # No ETHEUR kline, then the BTCEUR close for the quote asset
+        fake_requester.set(
+            "/api/v3/klines", [], [[1640995200000, "1", "1", "1", "40000.00"]]
+        )
+        trade = {"symbol": "ETHBTC", "id": 1, "price": "0.08", "qty": "1.5",
+                 "time": 1640995200000, "isBuyer": True}
+        
+        transaction = binance_service._normalize_trade(trade)
+        
+        assert transaction.price_eur == Decimal("0.08") * Decimal("40000.00")
+        assert [call[2]["symbol"] for call in fake_requester.calls] == [
+            "ETHEUR",
+            "BTCEUR",
+        ]
+
+    def test_trade_without_any_eur_price_raises(self, binance_service, fake_requester):
+        """Test that a trade with no EUR price is rejected, not priced at 1 EUR."""
+        fake_requester.set("/api/v3/klines", [])
+        trade = {"symbol": "ETHBTC", "id": 1, "price": "0.08", "qty": "1.5",
+                 "time": 1640995200000, "isBuyer": True}
+        
+        with pytest.raises(ValueError, match="No EUR price for ETH"):
+            binance_service._normalize_trade(trade)
+
+    def test_stablecoin_fee_uses_inverse_eur_market(
+        self, binance_service, fake_requester
+    ):
+        """Test that USDT commissions are converted with the inverse EURUSDT close."""
+        fake_requester.set("/api/v3/klines", [[1640995200000, "1", "1", "1", "1.1300"]])
+        trade = {"symbol": "BNBEUR", "id": 1, "price": "450.00", "qty": "1",
+                 "commission": "0.05", "commissionAsset": "USDT",
+                 "time": 1640995200000, "isBuyer": True}
+        
+        transaction = binance_service._normalize_trade(trade)
+        
+        assert transaction.fee == Decimal("0.05") * (Decimal("1") / Decimal("1.1300"))
+        assert [call[2]["symbol"] for call in fake_requester.calls] == [
+            "BNBEUR",
+            "EURUSDT",
+        ]
+
+    def test_calculate_transaction_fees(self, binance_service, monkeypatch):
         """Test calculation of transaction fees in EUR."""
         trade_with_fee = {
             "symbol": "BTCUSDT",
@@ -546,12 +754,12 @@ class TestBinanceAPITransactions:
             "isBuyer": True
         }
         
-        with patch.object(binance_service, '_get_eur_price') as mock_price:
-            mock_price.return_value = Decimal("42000.00")
-            
-            transaction = binance_service._normalize_trade(trade_with_fee)
-            
-            # Fee should be converted to EUR
-            expected_fee_eur = Decimal("0.000001") * Decimal("42000.00")
-            assert transaction.fee == expected_fee_eur
-            assert transaction.fee_asset == "EUR"
+        monkeypatch.setattr(
+            binance_service, "_get_eur_price", lambda asset, when: Decimal("42000.00")
+        )
+        
+        transaction = binance_service._normalize_trade(trade_with_fee)
+        
+        # Fee should be converted to EUR
+        assert transaction.fee == _EXPECTED_FEE_EUR
+        assert transaction.fee_asset == "EUR"
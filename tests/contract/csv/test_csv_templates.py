@@ -5,11 +5,13 @@ These tests define the expected behavior for CSV template generation,
 validation, and management before implementation.
 """
 
+import copy
 import pytest
 import pandas as pd
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+from crypto_tax_calculator.services import csv_template_manager as manager_module
 from crypto_tax_calculator.services.csv_template_manager import CSVTemplateManager
 
 
@@ -327,6 +329,53 @@ class TestCSVTemplates:
             assert len(errors) > 0
             assert any("invalid value" in error.lower() for error in errors)
 
+    def test_validate_csv_against_template_column_wise(
+        self, template_manager, sample_revolut_template
+    ):
+        """Test that template validation checks whole columns and reports bad rows."""
+        rows = sample_revolut_template["sample_data"] * 1000
+        csv_data = pd.DataFrame(rows)
+        csv_data.loc[10, "Amount"] = "not_a_number"
+        csv_data.loc[500, "Started Date"] = "invalid_date"
+        csv_data.loc[999, "State"] = "INVALID_STATE"
+        row_loop = AssertionError("row loop")
+        
+        with patch.object(template_manager, 'get_template') as mock_get_template, \
+                patch.object(pd.DataFrame, 'iterrows', side_effect=row_loop), \
+                patch.object(pd.DataFrame, 'itertuples', side_effect=row_loop):
+            mock_get_template.return_value = sample_revolut_template
+            
+            is_valid, errors = template_manager.validate_csv_against_template(
+                csv_data, "revolut"
+            )
+        
+        assert is_valid is False
+        assert len(errors) == 3
+        assert any("'Amount' at row 10" in error for error in errors)
+        assert any("'Started Date' at row 500" in error for error in errors)
+        assert any("'State' at row 999" in error for error in errors)
+
+    def test_validation_rules_precomputed_as_frozensets(
+        self, template_manager, sample_revolut_template
+    ):
+        """Test that allowed values become frozensets once per template version."""
+        template_manager.create_custom_template("revolut", sample_revolut_template)
+        invalid_csv = pd.DataFrame(sample_revolut_template["sample_data"] * 3)
+        invalid_csv.loc[1, "Currency"] = "DOGE"
+        
+        is_valid, errors = template_manager.validate_csv_against_template(invalid_csv, "revolut")
+        allowed = template_manager._allowed_sets[("revolut", "1.0")]
+        template_manager.validate_csv_against_template(invalid_csv, "revolut")
+        
+        assert is_valid is False
+        assert errors == ["Invalid value in column 'Currency' at row 1: 'DOGE'"]
+        assert allowed["Currency"] == frozenset(["BTC", "ETH", "LTC", "BCH", "XRP"])
+        assert template_manager._allowed_sets[("revolut", "1.0")] is allowed
+        
+        # Re-registering the version rebuilds its sets
+        template_manager.create_custom_template("revolut", sample_revolut_template)
+        assert ("revolut", "1.0") not in template_manager._allowed_sets
+
     def test_get_template_versions(self, template_manager):
         """Test getting available template versions for an exchange."""
         with patch.object(template_manager, 'template_versions') as mock_versions:
@@ -444,6 +493,17 @@ class TestCSVTemplates:
         assert stored_template["version"] == "1.1"
         assert "New Column" in stored_template["required_columns"]
 
+    def test_create_custom_template_archives_previous_version(self, template_manager):
+        """Test that registering a new version keeps every listed version."""
+        new_template = copy.deepcopy(template_manager.get_template("kraken"))
+        new_template["version"] = "2.0"
+        
+        template_manager.create_custom_template("kraken", new_template)
+        
+        assert template_manager.get_template_versions("kraken") == ["1.0", "2.0"]
+        assert template_manager.get_template("kraken", "1.0")["version"] == "1.0"
+        assert template_manager.get_template("kraken")["version"] == "2.0"
+
     def test_delete_template(self, template_manager, sample_revolut_template):
         """Test deleting template."""
         # Create template
@@ -539,3 +599,87 @@ class TestCSVTemplates:
             
             assert is_valid is True
             assert len(errors) == 0
+
+    def test_validate_csv_against_schema_compiles_once(
+        self, template_manager, sample_revolut_template
+    ):
+        """Test that the row schema is compiled once per template version and reused."""
+        import fastjsonschema
+        
+        valid_csv = pd.DataFrame(sample_revolut_template["sample_data"] * 3)
+        
+        with patch.object(template_manager, 'get_template') as mock_get_template, \
+                patch.object(manager_module.fastjsonschema, 'compile',
+                             wraps=fastjsonschema.compile) as mock_compile:
+            mock_get_template.return_value = sample_revolut_template
+            
+            first = template_manager.validate_csv_against_schema(valid_csv, "revolut")
+            second = template_manager.validate_csv_against_schema(valid_csv, "revolut")
+        
+        assert first == second == (True, [])
+        assert mock_compile.call_count == 1
+
+    def test_validate_csv_against_schema_skips_prechecked_rows(
+        self, template_manager, sample_revolut_template
+    ):
+        """Test that rows failing the column-wise checks skip the schema."""
+        invalid_csv = pd.DataFrame(sample_revolut_template["sample_data"] * 3)
+        invalid_csv.loc[1, "Amount"] = "not_a_number"
+        validated = []
+        
+        with patch.object(template_manager, 'get_template') as mock_get_template, \
+                patch.object(template_manager, '_compiled_schema',
+                             return_value=validated.append):
+            mock_get_template.return_value = sample_revolut_template
+            
+            is_valid, errors = template_manager.validate_csv_against_schema(
+                invalid_csv, "revolut"
+            )
+        
+        assert is_valid is False
+        assert len(errors) == 1
+        assert "'Amount' at row 1" in errors[0]
+        assert len(validated) == 2
+
+    def test_generate_template_schema_cached(
+        self, template_manager, sample_revolut_template
+    ):
+        """Test that schemas are built once per template version and are read-only."""
+        template_manager.create_custom_template("revolut", sample_revolut_template)
+        
+        schema = template_manager.generate_template_schema("revolut")
+        
+        assert template_manager.generate_template_schema("revolut") is schema
+        with pytest.raises(TypeError):
+            schema["type"] = "array"
+        
+        # A new version gets a freshly built schema
+        required_columns = sample_revolut_template["required_columns"] + ["New Column"]
+        updated_template = dict(
+            sample_revolut_template, version="1.1", required_columns=required_columns
+        )
+        template_manager.update_template("revolut", updated_template)
+        
+        updated_schema = template_manager.generate_template_schema("revolut")
+        assert updated_schema is not schema
+        assert "New Column" in updated_schema["properties"]
+        assert (
+            template_manager.generate_template_schema("revolut", version="1.0")
+            is not updated_schema
+        )
+
+    def test_get_latest_template_version_memoized(self, template_manager):
+        """Test that the latest version is computed once per list of versions."""
+        def version_key(version):
+            return tuple(map(int, version.split(".")))
+        
+        with patch.object(template_manager, 'template_versions') as mock_versions, \
+                patch.object(manager_module, '_version_key',
+                             side_effect=version_key) as mock_key:
+            mock_versions.get.return_value = ["1.0", "1.10", "1.9"]
+            
+            first = template_manager.get_latest_template_version("revolut")
+            second = template_manager.get_latest_template_version("revolut")
+        
+        assert first == second == "1.10"
+        assert mock_key.call_count == 3